@@ -1,5 +1,6 @@
 import os
 import re
+import hashlib
 
 features_dir = r"d:\MyPOC\Angular\angular-features\src\app\features"
 
@@ -10,72 +11,125 @@ def slugify(text):
     text = text.strip().replace(' ', '-')
     return text
 
-def generate_toc(content):
-    lines = content.split('\n')
-    toc = ["## 📋 Table of Contents"]
-    headers_found = False
-    
-    for line in lines:
+TOC_HEADING = "## 📋 Table of Contents"
+HEADING_RE = re.compile(r'^(##+)\s+(.*)')
+FENCE_RE = re.compile(r'^\s*(```|~~~)')
+
+def scan_guide(lines):
+    """Single streaming pass over a guide.
+
+    Returns (headings, toc_span, h1_index) where headings are (level, title)
+    pairs outside fenced code blocks, toc_span is the (start, end) line range
+    of an existing TOC heading plus its entries, and h1_index is the first H1.
+    """
+    headings = []
+    toc_start = toc_end = None
+    h1_index = -1
+    fence = None
+    in_toc = False
+
+    for i, line in enumerate(lines):
+        fence_match = FENCE_RE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif fence == marker:
+                fence = None
+            in_toc = False
+            continue
+        if fence:
+            continue
+
+        if in_toc:
+            if line.lstrip().startswith('- ['):
+                toc_end = i + 1
+                continue
+            in_toc = False
+
+        if toc_start is None and line.rstrip() == TOC_HEADING:
+            toc_start, toc_end = i, i + 1
+            in_toc = True
+            continue
+
+        if h1_index == -1 and line.startswith('# '):
+            h1_index = i
+
         # Match ## Header or ### Subheader
-        match = re.match(r'^(##+)\s+(.*)', line)
+        match = HEADING_RE.match(line)
         if match:
             level = len(match.group(1)) - 2 # 0 for ##, 1 for ###
-            title = match.group(2).strip()
-            # Clean title from existing markdown links if any
-            clean_title = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', title)
-            anchor = slugify(clean_title)
-            toc.append(f"{'  ' * level}- [{title}](#{anchor})")
-            headers_found = True
-            
-    if not headers_found:
+            headings.append((level, match.group(2).strip()))
+
+    toc_span = (toc_start, toc_end) if toc_start is not None else None
+    return headings, toc_span, h1_index
+
+def heading_anchor(title):
+    # Clean title from existing markdown links if any
+    clean_title = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', title)
+    return slugify(clean_title)
+
+def toc_lines(headings):
+    toc = [TOC_HEADING]
+    for level, title in headings:
+        toc.append(f"{'  ' * level}- [{title}](#{heading_anchor(title)})")
+    return toc
+
+def toc_digest(lines):
+    return hashlib.sha1('\n'.join(line.rstrip() for line in lines).encode('utf-8')).hexdigest()
+
+def generate_toc(content):
+    headings, _, _ = scan_guide(content.split('\n'))
+    if not headings:
+        return None
+    return '\n'.join(toc_lines(headings))
+
+def update_toc(content):
+    """Returns content with its TOC inserted or refreshed, or None if already current"""
+    lines = content.split('\n')
+    headings, toc_span, h1_index = scan_guide(lines)
+    if not headings:
         return None
-    return '\n'.join(toc)
+    new_toc = toc_lines(headings)
+
+    if toc_span:
+        start, end = toc_span
+        # Only rewrite when the heading set changed
+        if toc_digest(lines[start:end]) == toc_digest(new_toc):
+            return None
+        return '\n'.join(lines[:start] + new_toc + lines[end:])
+
+    # Insert TOC after the first H1 and its optional blockquote/intro
+    toc_md = '\n'.join(new_toc)
+    if h1_index == -1:
+         # If no H1, just prepend
+         return toc_md + "\n\n---\n\n" + content
+
+    # Look for where to insert
+    insert_pos = h1_index + 1
+    # Skip optional things like blockquotes or images right after H1
+    while insert_pos < len(lines):
+        line = lines[insert_pos].strip()
+        if line.startswith('>') or line.startswith('!') or line == '':
+            insert_pos += 1
+        else:
+            break
+    
+    new_lines = lines[:insert_pos]
+    new_lines.append("\n" + toc_md + "\n\n---")
+    new_lines.extend(lines[insert_pos:])
+    return '\n'.join(new_lines)
 
 def process_guide(file_path):
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
             
-        if "## 📋 Table of Contents" in content:
-            # print(f"Skipping (already has TOC): {file_path}")
-            return False
-
-        toc_md = generate_toc(content)
-        if not toc_md:
+        new_content = update_toc(content)
+        if new_content is None:
+            # print(f"Skipping (TOC up to date): {file_path}")
             return False
 
-        # Insert TOC after the first H1 and its optional blockquote/intro
-        lines = content.split('\n')
-        new_lines = []
-        inserted = False
-        
-        # Logic: find the first line starting with #
-        # Then find the next empty line or end of blockquote
-        h1_index = -1
-        for i, line in enumerate(lines):
-            if line.startswith('# '):
-                h1_index = i
-                break
-        
-        if h1_index == -1:
-             # If no H1, just prepend
-             new_content = toc_md + "\n\n---\n\n" + content
-        else:
-            # Look for where to insert
-            insert_pos = h1_index + 1
-            # Skip optional things like blockquotes or images right after H1
-            while insert_pos < len(lines):
-                line = lines[insert_pos].strip()
-                if line.startswith('>') or line.startswith('!') or line == '':
-                    insert_pos += 1
-                else:
-                    break
-            
-            new_lines = lines[:insert_pos]
-            new_lines.append("\n" + toc_md + "\n\n---")
-            new_lines.extend(lines[insert_pos:])
-            new_content = '\n'.join(new_lines)
-
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(new_content)
         return True
@@ -83,12 +137,16 @@ def process_guide(file_path):
         print(f"Error processing {file_path}: {e}")
     return False
 
-count = 0
-for root, dirs, files in os.walk(features_dir):
-    for file in files:
-        if file == "guide.md":
-            full_path = os.path.join(root, file)
-            if process_guide(full_path):
-                count += 1
+def main():
+    count = 0
+    for root, dirs, files in os.walk(features_dir):
+        for file in files:
+            if file == "guide.md":
+                full_path = os.path.join(root, file)
+                if process_guide(full_path):
+                    count += 1
+
+    print(f"TOC Refactoring complete. Total files updated: {count}")
 
-print(f"TOC Refactoring complete. Total files updated: {count}")
+if __name__ == "__main__":
+    main()
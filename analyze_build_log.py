@@ -0,0 +1,182 @@
+"""
+Streaming analyzer for Angular build logs (build_log.txt, build-errors.txt).
+
+The logs are console captures: UTF-16 or UTF-8 with a BOM, esbuild's
+markers garbled by the code page ("Γû▓ [WARNING]" for "▲ [WARNING]") and
+every line hard-wrapped at the console width, even inside file paths. Each
+file is decoded a few megabytes at a time and every diagnostic (header,
+wrapped message, wrapped location) is read by one precompiled pattern, so
+lines outside diagnostics never reach Python code and memory does not grow
+with the size of the log. Diagnostics
+are grouped by code (TS2307, NG8001, ...), file and feature folder, and
+imports that do not resolve are matched against fix_imports.MAPPINGS to
+show which renamed folder they refer to.
+
+Usage:
+    python analyze_build_log.py
+    python analyze_build_log.py build-errors.txt --top 5
+"""
+
+import os
+import re
+import sys
+import codecs
+import argparse
+from collections import Counter
+
+from fix_imports import MAPPINGS, base_dir, fix_paths
+
+repo_dir = os.path.dirname(base_dir)
+DEFAULT_LOGS = [os.path.join(repo_dir, "build_log.txt"), os.path.join(repo_dir, "build-errors.txt")]
+
+# A header at the start of a line, after at most a three-character marker.
+# The pattern starts with the literal "[" (which the regex engine searches for
+# quickly) and looks back for the line start; lookbehinds must be fixed-width.
+LINE_START = '|'.join([r'(?<=^\[)', r'(?<=\n\[)'] + [rf'(?<={anchor}\S{{{k}}} \[)'
+                                                   for anchor in ('^', r'\n') for k in (1, 2, 3)])
+# One diagnostic: "X [ERROR] TS2307: message" (esbuild errors may have no code),
+# the message's wrapped lines up to a blank line, then optionally the
+# location: a line indented by four spaces plus its unindented wrapped parts
+DIAGNOSTIC_RE = re.compile(
+    r'\[(?:' + LINE_START + r')(ERROR|WARNING)\] (?:((?:TS|NG)\d+): )?'
+    r'([^\n]*(?:\n(?![ \t]*(?:\n|$))[^\n]*)*)'
+    r'(?:\n(?:[ \t]*\n)+ {4}(\S[^\n]*(?:\n\S[^\n]*){0,7}))?')
+# The location once its wrapped lines are joined: "src/app/...ts:53:50:"
+LOCATION_RE = re.compile(r'^(\S[^:]*(?::\\[^:]*)?):(\d+):(\d+):')
+UNRESOLVED_RE = re.compile(r'''(?:Cannot find module|Could not resolve) ['"]([^'"]+)['"]''')
+PLUGIN_SUFFIX_RE = re.compile(r'\s*\[plugin [^\]]*\]$')
+
+# Characters decoded and scanned at a time; memory stays around this size
+CHUNK_CHARS = 1 << 22
+MESSAGE_CHARS = 160
+
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+def sniff_encoding(path):
+    with open(path, 'rb') as f:
+        head = f.read(4)
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    return 'utf-8'
+
+def last_header_line(text):
+    """Offset of the line holding the last header, or of the last line if there is none"""
+    header = max(text.rfind('[ERROR] '), text.rfind('[WARNING] '))
+    return text.rfind('\n', 0, header if header >= 0 else len(text)) + 1
+
+def read_diagnostics(path):
+    """Yields (count, severity, code, message, file, line) for the diagnostics in a log.
+
+    The log is decoded CHUNK_CHARS at a time. Each chunk is scanned up to
+    its last header, whose diagnostic may continue in the next chunk, and
+    identical diagnostics (a watch build repeats them) are counted in C
+    before any of them is looked at, so memory does not depend on the size
+    of the log.
+    """
+    with open(path, 'r', encoding=sniff_encoding(path), errors='replace') as f:
+        text = ''
+        while True:
+            chunk = f.read(CHUNK_CHARS)
+            text += chunk
+            cut = last_header_line(text) if chunk else len(text)
+            counts = Counter(DIAGNOSTIC_RE.findall(text, 0, cut))
+            for (severity, code, message, location), count in counts.items():
+                message = PLUGIN_SUFFIX_RE.sub('', ' '.join(message.replace('\n', '').split()))
+                found = LOCATION_RE.match(location.replace('\n', ''))
+                file, line = (found.group(1).replace('\\', '/'), int(found.group(2))) if found else (None, None)
+                yield count, severity.lower(), code or 'esbuild', message, file, line
+            if not chunk:
+                break
+            text = text[cut:]
+
+def feature_for_file(file):
+    """'signals' for src/app/features/signals/..., 'practice' for src/app/practice/..."""
+    if not file:
+        return '(no file)'
+    parts = file.split('/')
+    if 'features' in parts[:-1]:
+        return parts[parts.index('features') + 1]
+    if 'app' in parts[:-2]:
+        return parts[parts.index('app') + 1]
+    return '(other)'
+
+def rename_hint(spec, feature):
+    """How an unresolved import relates to a rename in fix_imports.MAPPINGS, or None"""
+    fixed, changed = fix_paths(f"'{spec}'", feature)
+    if changed:
+        return f"old folder name; fix_imports rewrites it to '{fixed[1:-1]}'"
+    segments = spec.split('/')
+    # The importer's own feature first, then any other
+    for mapped_feature in sorted(MAPPINGS, key=lambda name: name != feature):
+        for old, new in MAPPINGS[mapped_feature].items():
+            if new in segments:
+                return f"'{new}' is {mapped_feature}/{old} after the rename; is the folder renamed on disk?"
+    return None
+
+def analyze(paths):
+    by_code, by_file, by_feature = Counter(), Counter(), Counter()
+    examples = {}
+    unresolved = Counter()
+    totals = Counter()
+
+    for path in paths:
+        for count, severity, code, message, file, line in read_diagnostics(path):
+            totals[severity] += count
+            feature = feature_for_file(file)
+            by_code[(severity, code)] += count
+            by_feature[feature] += count
+            if file:
+                by_file[file] += count
+            examples.setdefault(code, message[:MESSAGE_CHARS])
+            missing = UNRESOLVED_RE.search(message)
+            if missing:
+                unresolved[(missing.group(1), feature, f"{file}:{line}" if file else '(no file)')] += count
+    return totals, by_code, by_file, by_feature, examples, unresolved
+
+def print_report(results, top):
+    totals, by_code, by_file, by_feature, examples, unresolved = results
+    print(f"{totals['error']} error(s), {totals['warning']} warning(s)")
+    if not by_code:
+        return
+
+    print("\nBy code:")
+    for (severity, code), count in by_code.most_common():
+        print(f"  {count:6}  {severity:7}  {code:8}  {examples[code]}")
+
+    print("\nBy feature:")
+    for feature, count in by_feature.most_common(top):
+        print(f"  {count:6}  {feature}")
+
+    print("\nBy file:")
+    for file, count in by_file.most_common(top):
+        print(f"  {count:6}  {file}")
+
+    if unresolved:
+        print("\nUnresolved imports:")
+        for (spec, feature, where), count in sorted(unresolved.items()):
+            hint = rename_hint(spec, feature)
+            times = f" (x{count})" if count > 1 else ""
+            print(f"  {where}  '{spec}'{times}")
+            if hint:
+                print(f"      {hint}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize Angular build logs by error code, file and feature")
+    parser.add_argument('logs', nargs='*', help="log files (default: build_log.txt and build-errors.txt)")
+    parser.add_argument('--top', type=int, default=10, help="files and features to list (default: 10)")
+    args = parser.parse_args(argv)
+
+    paths = args.logs or [path for path in DEFAULT_LOGS if os.path.exists(path)]
+    if not paths:
+        print("No build logs found.")
+        return 1
+    print_report(analyze(paths), args.top)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+Deterministic, incremental builder for angular-learning.zip.
+
+Entries are sorted, carry a fixed timestamp and fixed permissions, so the
+same tree always produces the same bytes. Media that is already compressed
+(PNG, MP4, ...) is stored as is; everything else is deflated in a thread
+pool (zlib releases the GIL). Members whose content did not change are
+copied compressed, byte for byte, from the previous archive instead of being
+compressed again, so repackaging after a docs edit only deflates the edited
+files.
+
+The zip is written directly (local headers, central directory) because the
+zipfile module cannot add an already-compressed member.
+
+Usage:
+    python build_bundle.py
+    python build_bundle.py --full
+"""
+
+import os
+import sys
+import json
+import zlib
+import struct
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from index_guides import output_file
+
+repo_dir = os.path.dirname(output_file)
+bundle_file = os.path.join(repo_dir, "angular-learning.zip")
+cache_file = os.path.join(repo_dir, ".bundle_cache.json")
+
+# What the archive ships, relative to the repo root
+BUNDLE_ROOTS = [
+    ".gitignore", "INPUT_OUTPUT_GUIDE.md", "README.md", "angular.json", "build-errors.txt", "build_log.txt",
+    "mock-api", "ngsw-config.json", "package-lock.json", "package.json", "src",
+    "tsconfig.app.json", "tsconfig.json", "tsconfig.spec.json",
+]
+EXCLUDE_DIRS = {'__pycache__', '.git', '.angular', 'dist'}
+EXCLUDE_EXTS = ('.pyc', '.tmp')
+
+# Already compressed: deflating again costs time and saves nothing
+STORED_EXTS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.mp4', '.mp3', '.m4a', '.webm',
+    '.zip', '.gz', '.pptx', '.docx', '.woff', '.woff2',
+}
+
+STORED, DEFLATED = 0, 8
+LEVEL = 9
+# 1980-01-01 00:00:00, the earliest DOS timestamp
+DOS_DATE, DOS_TIME = (1 << 5) | 1, 0
+FILE_ATTR = (0o100644 << 16)
+DIR_ATTR = (0o040755 << 16) | 0x10
+
+# Only members written by this exact configuration are reused, so output
+# bytes never depend on which tool produced the previous archive
+BUNDLE_COMMENT = f"angular-learning bundle v1 level={LEVEL} zlib={zlib.ZLIB_RUNTIME_VERSION}".encode('ascii')
+
+LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+END_RECORD = struct.Struct('<IHHHHIIH')
+
+def collect_entries():
+    """Sorted [(arcname, full_path, is_dir)] for everything the bundle ships"""
+    entries = []
+    for root_name in BUNDLE_ROOTS:
+        root_path = os.path.join(repo_dir, root_name)
+        if os.path.isfile(root_path):
+            entries.append((root_name, root_path, False))
+            continue
+        for dirpath, dirs, files in os.walk(root_path):
+            dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+            arc_dir = os.path.relpath(dirpath, repo_dir).replace(os.sep, '/')
+            entries.append((arc_dir + '/', dirpath, True))
+            for name in files:
+                if not name.endswith(EXCLUDE_EXTS):
+                    entries.append((f"{arc_dir}/{name}", os.path.join(dirpath, name), False))
+    return sorted(entries)
+
+def compress_method(arcname):
+    return STORED if os.path.splitext(arcname)[1].lower() in STORED_EXTS else DEFLATED
+
+def read_previous(path):
+    """Central directory of the previous archive: {name: (method, crc, csize, size, offset)}"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(-END_RECORD.size - len(BUNDLE_COMMENT), os.SEEK_END)
+            end = f.read()
+            if end[END_RECORD.size:] != BUNDLE_COMMENT:
+                return {}
+            _, _, _, _, count, cd_size, cd_offset, _ = END_RECORD.unpack(end[:END_RECORD.size])
+            f.seek(cd_offset)
+            data = f.read(cd_size)
+    except (OSError, struct.error):
+        return {}
+
+    members = {}
+    pos = 0
+    for _ in range(count):
+        fields = CENTRAL_HEADER.unpack_from(data, pos)
+        method, crc, csize, size = fields[4], fields[7], fields[8], fields[9]
+        name_len, extra_len, comment_len, offset = fields[10], fields[11], fields[12], fields[16]
+        pos += CENTRAL_HEADER.size
+        name = data[pos:pos + name_len].decode('utf-8')
+        pos += name_len + extra_len + comment_len
+        members[name] = (method, crc, csize, size, offset)
+    return members
+
+def load_cache():
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def prepare(arcname, full_path, previous):
+    """Worker: returns ('reuse', crc, size) or ('data', crc, size, compressed bytes)"""
+    with open(full_path, 'rb') as f:
+        data = f.read()
+    crc = zlib.crc32(data)
+    old = previous.get(arcname)
+    if old and old[0] == DEFLATED and old[1] == crc and old[3] == len(data):
+        return ('reuse', crc, len(data))
+    compressor = zlib.compressobj(LEVEL, zlib.DEFLATED, -15)
+    return ('data', crc, len(data), compressor.compress(data) + compressor.flush())
+
+def build_bundle(full=False, path=None):
+    path = path or bundle_file
+    entries = collect_entries()
+    previous = {} if full else read_previous(path)
+    cache = {} if full else load_cache()
+    new_cache = {}
+
+    # Deflate jobs start right away and are consumed in archive order
+    pool = ThreadPoolExecutor()
+    jobs = {}
+    for arcname, full_path, is_dir in entries:
+        if is_dir or compress_method(arcname) != DEFLATED:
+            continue
+        st = os.stat(full_path)
+        known = cache.get(arcname)
+        old = previous.get(arcname)
+        if (known and old and known[:2] == [st.st_size, st.st_mtime_ns]
+                and old[0] == DEFLATED and old[1] == known[2] and old[3] == st.st_size):
+            jobs[arcname] = ('reuse', known[2], st.st_size)
+        else:
+            jobs[arcname] = pool.submit(prepare, arcname, full_path, previous)
+
+    tmp_path = path + '.tmp'
+    central = []
+    reused = compressed = stored = 0
+    old_file = open(path, 'rb') if previous else None
+    try:
+        with open(tmp_path, 'wb') as out:
+            for arcname, full_path, is_dir in entries:
+                name = arcname.encode('utf-8')
+                flags = 0 if name.isascii() else 0x800
+                offset = out.tell()
+
+                if is_dir:
+                    method, crc, csize, size = STORED, 0, 0, 0
+                    out.write(LOCAL_HEADER.pack(0x04034b50, 20, flags, method, DOS_TIME, DOS_DATE,
+                                                crc, csize, size, len(name), 0) + name)
+                    central.append((name, flags, method, crc, csize, size, DIR_ATTR, offset))
+                    continue
+
+                st = os.stat(full_path)
+                method = compress_method(arcname)
+                if method == STORED:
+                    crc, size = write_stored(out, full_path, name, flags)
+                    csize = size
+                    stored += 1
+                else:
+                    job = jobs[arcname]
+                    result = job if isinstance(job, tuple) else job.result()
+                    crc, size = result[1], result[2]
+                    if result[0] == 'reuse':
+                        csize = previous[arcname][2]
+                        out.write(LOCAL_HEADER.pack(0x04034b50, 20, flags, method, DOS_TIME, DOS_DATE,
+                                                    crc, csize, size, len(name), 0) + name)
+                        copy_member_data(old_file, previous[arcname], out)
+                        reused += 1
+                    else:
+                        data = result[3]
+                        csize = len(data)
+                        out.write(LOCAL_HEADER.pack(0x04034b50, 20, flags, method, DOS_TIME, DOS_DATE,
+                                                    crc, csize, size, len(name), 0) + name)
+                        out.write(data)
+                        compressed += 1
+                central.append((name, flags, method, crc, csize, size, FILE_ATTR, offset))
+                new_cache[arcname] = [st.st_size, st.st_mtime_ns, crc]
+
+            cd_offset = out.tell()
+            for name, flags, method, crc, csize, size, attr, offset in central:
+                out.write(CENTRAL_HEADER.pack(0x02014b50, (3 << 8) | 20, 20, flags, method, DOS_TIME, DOS_DATE,
+                                              crc, csize, size, len(name), 0, 0, 0, 0, attr, offset) + name)
+            cd_size = out.tell() - cd_offset
+            if len(central) > 0xFFFF or out.tell() > 0xFFFFFFFF:
+                raise ValueError("Bundle is too large for a zip without zip64 extensions")
+            out.write(END_RECORD.pack(0x06054b50, 0, 0, len(central), len(central), cd_size, cd_offset,
+                                      len(BUNDLE_COMMENT)) + BUNDLE_COMMENT)
+    finally:
+        pool.shutdown(cancel_futures=True)
+        if old_file:
+            old_file.close()
+
+    os.replace(tmp_path, path)
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump(new_cache, f, separators=(',', ':'), sort_keys=True)
+    print(f"Bundle written: {path} ({len(central)} entries: {compressed} deflated, "
+          f"{reused} reused, {stored} stored)")
+    return path
+
+def copy_member_data(old_file, member, out, chunk_size=1 << 20):
+    """Copies a member's compressed bytes from the previous archive"""
+    offset, csize = member[4], member[2]
+    old_file.seek(offset)
+    header = LOCAL_HEADER.unpack(old_file.read(LOCAL_HEADER.size))
+    old_file.seek(header[9] + header[10], os.SEEK_CUR)
+    while csize:
+        chunk = old_file.read(min(chunk_size, csize))
+        out.write(chunk)
+        csize -= len(chunk)
+
+def write_stored(out, full_path, name, flags, chunk_size=1 << 20):
+    """Streams a stored member, patching its CRC into the local header afterwards"""
+    header_pos = out.tell()
+    out.write(LOCAL_HEADER.pack(0x04034b50, 20, flags, STORED, DOS_TIME, DOS_DATE, 0, 0, 0, len(name), 0) + name)
+    crc = size = 0
+    with open(full_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            out.write(chunk)
+    end = out.tell()
+    out.seek(header_pos)
+    out.write(LOCAL_HEADER.pack(0x04034b50, 20, flags, STORED, DOS_TIME, DOS_DATE, crc, size, size, len(name), 0))
+    out.seek(end)
+    return crc, size
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build angular-learning.zip deterministically and incrementally")
+    parser.add_argument('--full', action='store_true', help="ignore the previous archive and compress everything")
+    parser.add_argument('--output', help="archive path (default: angular-learning.zip in the repo root)")
+    args = parser.parse_args(argv)
+    build_bundle(args.full, args.output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
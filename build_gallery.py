@@ -0,0 +1,208 @@
+"""
+Responsive image variants for src/assets/gallery-images.
+
+Builds thumbnails plus WebP (and AVIF, when Pillow supports it) variants at
+several widths in a process pool, writes a srcset manifest for the Angular
+gallery and regenerates gallery.md with thumbnails linking to the originals.
+Variants are named after the source's content hash, so an unchanged image is
+never re-encoded and a changed one gets new, cache-busting file names.
+
+Usage:
+    python build_gallery.py
+    python build_gallery.py --force
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+
+from PIL import Image, features
+
+from fingerprints import file_hash
+from index_guides import output_file, write_if_changed
+from worker_pool import run_jobs
+
+repo_dir = os.path.dirname(output_file)
+gallery_dir = os.path.join(repo_dir, "src", "assets", "gallery-images")
+variants_dir = os.path.join(gallery_dir, "variants")
+manifest_file = os.path.join(gallery_dir, "manifest.json")
+gallery_md = os.path.join(repo_dir, "gallery.md")
+cache_file = os.path.join(repo_dir, ".gallery_cache.json")
+
+WIDTHS = (320, 640, 1280)
+THUMB_WIDTH = 320
+ASSET_URL = "assets/gallery-images"
+SOURCE_EXTS = ('.png', '.jpg', '.jpeg')
+
+# Encoder settings per output format, best compression first
+FORMATS = [("avif", "image/avif", {"quality": 50}), ("webp", "image/webp", {"quality": 80, "method": 6})]
+
+# <feature>_<n>_<name>.png
+NAME_RE = re.compile(r'^(?P<feature>.+?)_(?P<number>\d+)_(?P<name>.+)$')
+
+def available_formats():
+    """AVIF needs a Pillow build with libavif; WebP is always expected"""
+    return [fmt for fmt in FORMATS if fmt[0] != "avif" or features.check("avif")]
+
+def variant_name(stem, digest, width, ext):
+    return f"{stem}-{digest[:10]}-{width}.{ext}"
+
+def target_widths(source_width):
+    widths = [w for w in WIDTHS if w < source_width]
+    return widths or [source_width]
+
+def render_variants(src_path, stem, digest, formats):
+    """Worker: decodes the source once and encodes every width/format variant"""
+    with Image.open(src_path) as img:
+        img.load()
+        source_size = img.size
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+        written = []
+        for width in target_widths(source_size[0]):
+            height = round(source_size[1] * width / source_size[0])
+            resized = img if width == source_size[0] else img.resize((width, height), Image.LANCZOS)
+            for ext, _, options in formats:
+                name = variant_name(stem, digest, width, ext)
+                out_path = os.path.join(variants_dir, name)
+                if not os.path.exists(out_path):
+                    resized.save(out_path + ".tmp", format=ext.upper(), **options)
+                    os.replace(out_path + ".tmp", out_path)
+                written.append(name)
+    return source_size, written
+
+def load_cache():
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def sort_key(file_name):
+    match = NAME_RE.match(os.path.splitext(file_name)[0])
+    if not match:
+        return (file_name, 0, file_name)
+    return (match.group('feature'), int(match.group('number')), file_name)
+
+def build_variants(force=False):
+    """Brings every variant up to date; returns {file_name: cache entry}"""
+    os.makedirs(variants_dir, exist_ok=True)
+    formats = available_formats()
+    format_key = ",".join(fmt[0] for fmt in formats) + "|" + ",".join(map(str, WIDTHS))
+    cache = {} if force else load_cache()
+
+    sources = sorted((f for f in os.listdir(gallery_dir) if f.lower().endswith(SOURCE_EXTS)), key=sort_key)
+    pending = []
+    entries = {}
+    for file_name in sources:
+        src_path = os.path.join(gallery_dir, file_name)
+        st = os.stat(src_path)
+        entry = cache.get(file_name)
+        if entry and entry['size'] == st.st_size and entry['mtime'] == st.st_mtime_ns:
+            digest = entry['hash']
+        else:
+            digest = file_hash(src_path)
+
+        if (entry and entry['hash'] == digest and entry['formats'] == format_key
+                and all(os.path.exists(os.path.join(variants_dir, v)) for v in entry['variants'])):
+            entry.update(size=st.st_size, mtime=st.st_mtime_ns)
+            entries[file_name] = entry
+        else:
+            entries[file_name] = {'size': st.st_size, 'mtime': st.st_mtime_ns, 'hash': digest,
+                                  'formats': format_key}
+            pending.append(file_name)
+
+    if pending:
+        print(f"Encoding variants for {len(pending)} image(s)...")
+        jobs = {
+            file_name: (os.path.join(gallery_dir, file_name), os.path.splitext(file_name)[0],
+                        entries[file_name]['hash'], formats)
+            for file_name in pending
+        }
+        for file_name, result, error in run_jobs(render_variants, jobs):
+            if error:
+                print(f"Error processing {file_name}: {error}")
+                del entries[file_name]
+                continue
+            (width, height), variants = result
+            entries[file_name].update(width=width, height=height, variants=variants)
+
+    # Drop variants of deleted or changed sources
+    keep = {v for entry in entries.values() for v in entry['variants']}
+    for name in os.listdir(variants_dir):
+        if name not in keep:
+            os.remove(os.path.join(variants_dir, name))
+
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, indent=1)
+    print(f"Variants up to date: {len(entries)} images, {len(pending)} re-encoded.")
+    return entries
+
+def build_manifest(entries):
+    """srcset manifest consumed by the Angular gallery"""
+    formats = available_formats()
+    images = []
+    for file_name, entry in entries.items():
+        stem = os.path.splitext(file_name)[0]
+        match = NAME_RE.match(stem)
+        widths = target_widths(entry['width'])
+        thumb_width = min(widths, key=lambda w: abs(w - THUMB_WIDTH))
+        images.append({
+            "file": file_name,
+            "feature": match.group('feature') if match else None,
+            "width": entry['width'],
+            "height": entry['height'],
+            "src": f"{ASSET_URL}/{file_name}",
+            "thumbnail": f"{ASSET_URL}/variants/{variant_name(stem, entry['hash'], thumb_width, 'webp')}",
+            "sources": [
+                {
+                    "type": mime,
+                    "srcset": ", ".join(
+                        f"{ASSET_URL}/variants/{variant_name(stem, entry['hash'], w, ext)} {w}w" for w in widths
+                    ),
+                }
+                for ext, mime, _ in formats
+            ],
+        })
+    return json.dumps({"images": images}, indent=2) + "\n"
+
+def build_gallery_md(entries):
+    out = ["# Image Gallery\n\n"]
+    current_feature = None
+    for file_name, entry in entries.items():
+        stem = os.path.splitext(file_name)[0]
+        match = NAME_RE.match(stem)
+        feature = match.group('feature') if match else "other"
+        if feature != current_feature:
+            if current_feature is not None:
+                out.append("---\n\n")
+            current_feature = feature
+            out.append(f"## {feature.upper()}\n\n")
+
+        widths = target_widths(entry['width'])
+        thumb_width = min(widths, key=lambda w: abs(w - THUMB_WIDTH))
+        thumb = f"src/assets/gallery-images/variants/{variant_name(stem, entry['hash'], thumb_width, 'webp')}"
+        full = f"src/assets/gallery-images/{file_name}"
+        out.append(f"### Use Case {match.group('number') if match else '-'}\n")
+        out.append(f"**File**: `{file_name}`\n\n")
+        out.append(f"[![{file_name}]({thumb})]({full})\n\n")
+    if current_feature is not None:
+        out.append("---\n\n")
+    return ''.join(out)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build responsive variants for the image gallery")
+    parser.add_argument('--force', action='store_true', help="ignore the cache and re-encode everything")
+    args = parser.parse_args(argv)
+
+    entries = build_variants(args.force)
+    for path, content in ((manifest_file, build_manifest(entries)), (gallery_md, build_gallery_md(entries))):
+        if write_if_changed(path, content):
+            print(f"Updated: {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
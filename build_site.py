@@ -0,0 +1,229 @@
+"""
+Static HTML site for the feature guides.
+
+Renders every guide found by index_guides to site/<feature>/.../guide.html in
+a process pool, with heading ids from the same slug rule as the guide TOCs
+(add_toc_to_guides), so "#anchor" links keep working. Images a guide refers
+to are copied to site/assets under a content-hash name. A page is only
+re-rendered when its markdown, one of its images (including one that was
+missing and has appeared) or the renderer changed.
+
+Usage:
+    python build_site.py
+    python build_site.py --force
+"""
+
+import os
+import re
+import sys
+import html
+import json
+import shutil
+import argparse
+from urllib.parse import unquote, quote
+
+import markdown
+
+import index_guides
+from add_toc_to_guides import heading_anchor
+from fingerprints import file_hash
+from worker_pool import run_jobs
+
+repo_dir = os.path.dirname(index_guides.output_file)
+site_dir = os.path.join(repo_dir, "site")
+assets_dir = os.path.join(site_dir, "assets")
+cache_file = os.path.join(repo_dir, ".site_cache.json")
+
+# Bump when the template or the markdown options change, to re-render every page
+RENDER_VERSION = 2
+MARKDOWN_EXTENSIONS = ['extra', 'sane_lists', 'toc']
+
+IMG_SRC_RE = re.compile(r'(<img\b[^>]*?\bsrc=")([^"]+)(")')
+GUIDE_HREF_RE = re.compile(r'(<a\b[^>]*?\bhref=")([^":#]+guide\.md)(#[^"]*)?(")')
+EXTERNAL_PREFIXES = ('http://', 'https://', 'data:', 'file:', '//')
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="stylesheet" href="{root}/style.css">
+</head>
+<body>
+<nav><a href="{root}/index.html">&larr; All guides</a></nav>
+<main>
+{body}
+</main>
+</body>
+</html>
+"""
+
+STYLE = """body { font-family: system-ui, sans-serif; line-height: 1.6; margin: 0; color: #1f2328; }
+nav { padding: 0.75rem 2rem; border-bottom: 1px solid #d0d7de; }
+main { max-width: 960px; margin: 0 auto; padding: 1rem 2rem 4rem; }
+pre { background: #f6f8fa; padding: 1rem; overflow-x: auto; }
+code { font-family: ui-monospace, Consolas, monospace; font-size: 0.9em; }
+table { border-collapse: collapse; }
+th, td { border: 1px solid #d0d7de; padding: 0.35rem 0.75rem; }
+img { max-width: 100%; }
+blockquote { margin-left: 0; padding-left: 1rem; border-left: 4px solid #d0d7de; color: #57606a; }
+"""
+
+def toc_slugify(value, separator):
+    # Same anchors as the "## 📋 Table of Contents" entries in the guides
+    return heading_anchor(value)
+
+def page_path(rel_path):
+    return os.path.join(site_dir, os.path.splitext(rel_path)[0] + ".html")
+
+def copy_asset(src_path):
+    """Copies an image to site/assets under a content-hash name, once"""
+    stem, ext = os.path.splitext(os.path.basename(src_path))
+    name = f"{stem}-{file_hash(src_path)[:10]}{ext.lower()}"
+    out_path = os.path.join(assets_dir, name)
+    if not os.path.exists(out_path):
+        tmp_path = f"{out_path}.{os.getpid()}.tmp"
+        shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, out_path)
+    return name
+
+def render_page(full_path, rel_path, title):
+    """Worker: renders one guide; returns its image dependencies and asset names"""
+    with open(full_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    body = markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS,
+                             extension_configs={'toc': {'slugify': toc_slugify}})
+
+    out_path = page_path(rel_path)
+    out_dir = os.path.dirname(out_path)
+    root = os.path.relpath(site_dir, out_dir).replace(os.sep, '/')
+    source_dir = os.path.dirname(full_path)
+    deps, assets = [], []
+
+    def rewrite_img(match):
+        src = match.group(2)
+        if src.lower().startswith(EXTERNAL_PREFIXES):
+            return match.group(0)
+        img_path = os.path.normpath(os.path.join(source_dir, unquote(src)))
+        if not os.path.isfile(img_path):
+            # Still a dependency: the page is re-rendered once the image appears
+            deps.append([img_path, -1, -1])
+            return match.group(0)
+        name = copy_asset(img_path)
+        st = os.stat(img_path)
+        deps.append([img_path, st.st_size, st.st_mtime_ns])
+        assets.append(name)
+        return f"{match.group(1)}{root}/assets/{quote(name)}{match.group(3)}"
+
+    def rewrite_href(match):
+        target = match.group(2)[:-len(".md")] + ".html"
+        return f"{match.group(1)}{target}{match.group(3) or ''}{match.group(4)}"
+
+    body = IMG_SRC_RE.sub(rewrite_img, body)
+    body = GUIDE_HREF_RE.sub(rewrite_href, body)
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(out_path, 'w', encoding='utf-8') as f:
+        f.write(PAGE_TEMPLATE.format(title=html.escape(title), root=root, body=body))
+    return deps, assets
+
+def load_cache():
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get('pages', {}) if cache.get('render') == render_key() else {}
+
+def save_cache(pages):
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump({'render': render_key(), 'pages': pages}, f, separators=(',', ':'))
+
+def render_key():
+    return f"{RENDER_VERSION}|{markdown.__version__}|{','.join(MARKDOWN_EXTENSIONS)}"
+
+def is_current(entry, st, rel_path):
+    if not entry or entry['size'] != st.st_size or entry['mtime'] != st.st_mtime_ns:
+        return False
+    if not os.path.exists(page_path(rel_path)):
+        return False
+    for path, size, mtime in entry['deps']:
+        if size < 0:
+            if os.path.isfile(path):
+                return False
+            continue
+        try:
+            dep = os.stat(path)
+        except OSError:
+            return False
+        if dep.st_size != size or dep.st_mtime_ns != mtime:
+            return False
+    return True
+
+def render_index(guides):
+    out = ["<h1>Angular Features Documentation</h1>\n"]
+    current_feature = None
+    for guide in guides:
+        if guide['feature'] != current_feature:
+            if current_feature is not None:
+                out.append("</ul>\n")
+            current_feature = guide['feature']
+            out.append(f"<h2>{html.escape(current_feature.replace('-', ' ').title())}</h2>\n<ul>\n")
+        href = os.path.splitext(guide['path'])[0].replace(os.sep, '/') + ".html"
+        out.append(f'<li><a href="{quote(href)}">{html.escape(guide["title"])}</a></li>\n')
+    if current_feature is not None:
+        out.append("</ul>\n")
+    return PAGE_TEMPLATE.format(title="Angular Features Documentation", root=".", body=''.join(out))
+
+def build_site(force=False):
+    os.makedirs(assets_dir, exist_ok=True)
+    title_cache = index_guides.load_cache()
+    guides, _ = index_guides.collect_guides(title_cache)
+    index_guides.save_cache(title_cache)
+
+    pages = {} if force else load_cache()
+    stats = {guide['path']: os.stat(guide['full_path']) for guide in guides}
+    stale = [guide for guide in guides if not is_current(pages.get(guide['path']), stats[guide['path']], guide['path'])]
+
+    if stale:
+        print(f"Rendering {len(stale)} of {len(guides)} guide(s)...")
+        jobs = {guide['path']: (guide['full_path'], guide['path'], guide['title']) for guide in stale}
+        for rel_path, result, error in run_jobs(render_page, jobs):
+            if error:
+                print(f"Error rendering {rel_path}: {error}")
+                pages.pop(rel_path, None)
+                continue
+            deps, assets = result
+            st = stats[rel_path]
+            pages[rel_path] = {'size': st.st_size, 'mtime': st.st_mtime_ns, 'deps': deps, 'assets': assets}
+
+    # Drop the pages of deleted guides, then assets no page refers to
+    for rel_path in set(pages) - set(stats):
+        del pages[rel_path]
+        try:
+            os.remove(page_path(rel_path))
+        except OSError:
+            pass
+    keep = {name for entry in pages.values() for name in entry['assets']}
+    for name in os.listdir(assets_dir):
+        if name not in keep:
+            os.remove(os.path.join(assets_dir, name))
+
+    save_cache(pages)
+    for path, content in ((os.path.join(site_dir, "index.html"), render_index(guides)),
+                          (os.path.join(site_dir, "style.css"), STYLE)):
+        if index_guides.write_if_changed(path, content):
+            print(f"Updated: {path}")
+    print(f"Site up to date: {len(guides)} guides, {len(stale)} rendered, {len(keep)} assets.")
+    return guides
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the feature guides to a static HTML site")
+    parser.add_argument('--force', action='store_true', help="ignore the cache and re-render every guide")
+    args = parser.parse_args(argv)
+    build_site(args.force)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
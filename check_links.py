@@ -0,0 +1,204 @@
+"""
+Link and anchor checker for the markdown docs.
+
+Builds a cached index of every markdown file's heading anchors (using the
+same slug rule as add_toc_to_guides) and its relative links, then resolves
+each link to a file and, for markdown targets, to an anchor. Later runs only
+re-parse files whose size or mtime changed and only re-check the markdown
+links of files that changed or that link to a changed file. Links to
+anything else (images, folders, source files) are a stat each and are
+checked on every run.
+
+Usage:
+    python check_links.py            # exit code 1 if anything is broken
+    python check_links.py --full     # ignore the cache
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from urllib.parse import unquote
+from concurrent.futures import ThreadPoolExecutor
+
+from add_toc_to_guides import FENCE_RE, heading_anchor
+from index_guides import PRUNE_DIRS, output_file
+
+repo_dir = os.path.dirname(output_file)
+cache_file = os.path.join(repo_dir, ".link_check_cache.json")
+CACHE_VERSION = 2
+
+# video-frames holds voiceover scripts, so only the pure asset folders are pruned
+SKIP_DIRS = (PRUNE_DIRS - {'video-frames'}) | {'.git', '.angular', 'dist'}
+
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.*)')
+LINK_RE = re.compile(r'!?\[(?:[^\[\]]|\[[^\]]*\])*\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)')
+HTML_ANCHOR_RE = re.compile(r'<a\s+(?:name|id)="([^"]+)"')
+INLINE_CODE_RE = re.compile(r'`[^`]*`')
+EXTERNAL_PREFIXES = ('http://', 'https://', 'mailto:', 'data:', 'file:', 'tel:')
+
+def find_markdown(root_dir):
+    """Maps full path -> (size, mtime) for every .md file"""
+    found = {}
+    for root, dirs, files in os.walk(root_dir):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            if name.endswith('.md'):
+                full_path = os.path.join(root, name)
+                st = os.stat(full_path)
+                found[full_path] = (st.st_size, st.st_mtime_ns)
+    return found
+
+def parse_markdown(full_path):
+    """Returns (anchors, links) where links are [target, line] outside code"""
+    try:
+        with open(full_path, 'r', encoding='utf-8') as f:
+            lines = f.read().split('\n')
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading {full_path}: {e}")
+        return [], []
+
+    anchors = []
+    seen = {}
+    links = []
+    fence = None
+    for line_no, line in enumerate(lines, 1):
+        fence_match = FENCE_RE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            fence = marker if fence is None else (None if fence == marker else fence)
+            continue
+        if fence:
+            continue
+
+        match = HEADING_RE.match(line)
+        if match:
+            anchor = heading_anchor(match.group(2).strip())
+            # Repeated headings get -1, -2, ... like GitHub
+            count = seen.get(anchor, 0)
+            seen[anchor] = count + 1
+            anchors.append(anchor if count == 0 else f"{anchor}-{count}")
+
+        anchors.extend(HTML_ANCHOR_RE.findall(line))
+        for target in LINK_RE.findall(INLINE_CODE_RE.sub('', line)):
+            if not target.lower().startswith(EXTERNAL_PREFIXES):
+                links.append([target, line_no])
+    return anchors, links
+
+def resolve_link(source, target):
+    """Returns (target_path or None, anchor or None)"""
+    path, _, anchor = target.partition('#')
+    path = unquote(path)
+    if not path:
+        return source, anchor or None
+    if path.startswith('/'):
+        resolved = os.path.join(repo_dir, path.lstrip('/'))
+    else:
+        resolved = os.path.join(os.path.dirname(source), path)
+    return os.path.normpath(resolved), anchor or None
+
+def is_markdown_target(path, anchors_by_file):
+    return path in anchors_by_file or path.endswith('.md')
+
+def check_file(source, links, anchors_by_file):
+    """Returns [[target, line, reason], ...] for the broken markdown links of one file"""
+    broken = []
+    for target, line in links:
+        path, anchor = resolve_link(source, target)
+        if not is_markdown_target(path, anchors_by_file):
+            continue
+        if path not in anchors_by_file and not os.path.exists(path):
+            broken.append([target, line, "missing file"])
+        elif anchor and path.endswith('.md'):
+            anchors = anchors_by_file.get(path)
+            if anchors is not None and unquote(anchor) not in anchors:
+                broken.append([target, line, "missing anchor"])
+    return broken
+
+def check_other_targets(source, links, anchors_by_file):
+    """Returns [[target, line, reason], ...] for links to non-markdown files that do not exist"""
+    broken = []
+    for target, line in links:
+        path, _ = resolve_link(source, target)
+        if not is_markdown_target(path, anchors_by_file) and not os.path.exists(path):
+            broken.append([target, line, "missing file"])
+    return broken
+
+def load_cache():
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get('files', {}) if cache.get('version') == CACHE_VERSION else {}
+
+def save_cache(files):
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'files': files}, f, separators=(',', ':'))
+
+def check_links(full=False):
+    """Checks every markdown file, returns {source: broken_links}"""
+    cache = {} if full else load_cache()
+    found = find_markdown(repo_dir)
+
+    changed = [
+        path for path, (size, mtime) in found.items()
+        if path not in cache or cache[path]['size'] != size or cache[path]['mtime'] != mtime
+    ]
+    removed = [path for path in cache if path not in found]
+
+    with ThreadPoolExecutor() as pool:
+        for path, (anchors, links) in zip(changed, pool.map(parse_markdown, changed)):
+            size, mtime = found[path]
+            cache[path] = {'size': size, 'mtime': mtime, 'anchors': anchors, 'links': links, 'broken': None}
+        for path in removed:
+            del cache[path]
+
+        # Re-check the markdown links of changed files and of every file linking to a changed or removed file
+        dirty = set(changed) | set(removed)
+        to_check = [
+            path for path, entry in cache.items()
+            if entry['broken'] is None
+            or any(resolve_link(path, target)[0] in dirty for target, _ in entry['links'])
+        ]
+        anchors_by_file = {path: set(entry['anchors']) for path, entry in cache.items()}
+        results = pool.map(lambda path: check_file(path, cache[path]['links'], anchors_by_file), to_check)
+        for path, broken in zip(to_check, results):
+            cache[path]['broken'] = broken
+
+        # Images, folders and source files are not tracked by the cache: stat them every run
+        sources = list(cache)
+        others = pool.map(lambda path: check_other_targets(path, cache[path]['links'], anchors_by_file), sources)
+        missing_others = dict(zip(sources, others))
+
+    save_cache(cache)
+    print(f"Checked {len(to_check)} of {len(cache)} markdown files ({len(changed)} changed).")
+    broken = {}
+    for path, entry in cache.items():
+        found_broken = sorted(entry['broken'] + missing_others[path], key=lambda item: item[1])
+        if found_broken:
+            broken[path] = found_broken
+    return broken
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check relative links and anchors in the markdown docs")
+    parser.add_argument('--full', action='store_true', help="ignore the cache and re-check everything")
+    args = parser.parse_args(argv)
+
+    broken = check_links(args.full)
+    total = 0
+    for source in sorted(broken):
+        rel = os.path.relpath(source, repo_dir)
+        for target, line, reason in broken[source]:
+            print(f"{rel}:{line}: {target} ({reason})")
+            total += 1
+
+    if total:
+        print(f"\n{total} broken link(s) in {len(broken)} file(s).")
+        return 1
+    print("No broken links.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
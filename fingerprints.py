@@ -0,0 +1,122 @@
+"""
+Shared file fingerprint store for the maintenance scripts.
+
+Remembers, per tool, the size, mtime, content hash and detected encoding of
+every file it has processed, together with the version of the rule set that
+processed it. A file whose fingerprint is current is skipped without being
+opened. When only the mtime moved (a checkout, a touch), the content hash
+decides whether the file really changed.
+"""
+
+import os
+import json
+import hashlib
+
+STORE_FILE = os.path.join(r"d:\MyPOC\Angular\angular-features", ".fingerprints.json")
+STORE_VERSION = 1
+
+def rules_version(*parts):
+    """Short hash of whatever defines a tool's rules (patterns, mapping tables)"""
+    data = json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha1(data).hexdigest()[:12]
+
+def content_hash(data):
+    return hashlib.sha1(data).hexdigest()
+
+def file_hash(path):
+    """content_hash of a file, read a megabyte at a time"""
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def decode(data):
+    """Decodes bytes as utf-8 with a latin-1 fallback; returns (text, encoding).
+
+    Newlines are normalised the same way open(..., 'r') does.
+    """
+    try:
+        text, encoding = data.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        text, encoding = data.decode('latin-1'), 'latin-1'
+    return text.replace('\r\n', '\n').replace('\r', '\n'), encoding
+
+def read_bytes(file_path):
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+class FingerprintStore:
+    """Fingerprints of the files one tool has already processed with its current rules"""
+
+    def __init__(self, tool, rules, path=None):
+        self.tool = tool
+        self.rules = rules
+        self.path = path or STORE_FILE
+        self.entries = self._load().get(tool, {})
+        self.dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                store = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if store.get('version') != STORE_VERSION:
+            return {}
+        return store.get('tools', {})
+
+    def save(self):
+        if not self.dirty:
+            return
+        # Re-read so concurrent tools don't drop each other's entries
+        merged = self._load()
+        merged[self.tool] = self.entries
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STORE_VERSION, 'tools': merged}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def is_current(self, file_path, st=None):
+        """True if the file was processed by the current rules and has not changed since.
+
+        Only stats the file, unless the mtime moved while the size did not, in
+        which case the bytes are hashed to tell a touch from an edit.
+        """
+        entry = self.entries.get(file_path)
+        if not entry or entry['rules'] != self.rules:
+            return False
+        st = st or os.stat(file_path)
+        if entry['size'] != st.st_size:
+            return False
+        if entry['mtime'] == st.st_mtime_ns:
+            return True
+        with open(file_path, 'rb') as f:
+            if content_hash(f.read()) != entry['hash']:
+                return False
+        entry['mtime'] = st.st_mtime_ns
+        self.dirty = True
+        return True
+
+    def encoding(self, file_path):
+        entry = self.entries.get(file_path)
+        return entry['encoding'] if entry else None
+
+    def record(self, file_path, data, encoding):
+        """Marks the file, whose current bytes are `data`, as processed by the current rules"""
+        st = os.stat(file_path)
+        self.entries[file_path] = {
+            'size': st.st_size,
+            'mtime': st.st_mtime_ns,
+            'hash': content_hash(data),
+            'encoding': encoding,
+            'rules': self.rules,
+        }
+        self.dirty = True
+
+    def forget_missing(self, seen):
+        """Drops entries for files that were not seen in this run's walk"""
+        for file_path in set(self.entries) - set(seen):
+            del self.entries[file_path]
+            self.dirty = True
@@ -1,6 +1,8 @@
 import os
 import re
 
+from fingerprints import FingerprintStore, decode, read_bytes, rules_version
+
 # Comprehensive mapping for all renamed features
 MAPPINGS = {
     'input-output': {
@@ -74,61 +76,93 @@ MAPPINGS = {
     }
 }
 
+def _alternation(words):
+    # Longest first so e.g. use-case-10 is tried before use-case-1
+    return '|'.join(re.escape(w) for w in sorted(words, key=lambda w: (-len(w), w)))
+
+# The whole mapping table compiled once into a single matcher:
+#   1. [feature]/components/[old] or [feature]/[old], where [feature] is a whole
+#      name (not the tail of e.g. model-signals/)
+#   2. [old] preceded by a slash, dot or quote (relative paths within a feature)
+# Both forms must be followed by a slash, dot or quote.
+PATH_PATTERN = re.compile(
+    rf'(?<![\w-])(?P<prefix>(?:{_alternation(MAPPINGS)})/(?:components/|))(?P<qualified>{{old}})(?=[/.\'"])'
+    rf'|(?<=[/.\'"])(?P<relative>{{old}})(?=[/.\'"])'
+    .replace('{old}', _alternation({old for mapping in MAPPINGS.values() for old in mapping}))
+)
+
 def fix_paths(content, current_feature):
-    modified = False
-    
-    # 1. Broad replacement for paths that include the feature name
-    for feature, mapping in MAPPINGS.items():
-        for old, new in mapping.items():
-            # Match [feature]/components/[old] or [feature]/[old]
-            pattern = re.compile(rf'({feature}/(?:components/|))({old})(?=[/.\'"])')
-            if pattern.search(content):
-                content = pattern.sub(rf'\1{new}', content)
-                modified = True
-
-    # 2. Context-aware replacement for relative paths within the same feature
-    if current_feature in MAPPINGS:
-        mapping = MAPPINGS[current_feature]
-        for old, new in mapping.items():
-            # Match "./[old]" or "../[old]" or just "/[old]/"
-            # We look for [old] preceded by a slash or dot and followed by a slash or quote
-            pattern = re.compile(rf'(?<=[\/.\'"])({old})(?=[\/.\'"])')
-            if pattern.search(content):
-                content = pattern.sub(new, content)
-                modified = True
-                
-    return content, modified
+    """Rewrites renamed feature folders in a single scan of the content"""
+    local_mapping = MAPPINGS.get(current_feature, {})
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        if match.group('qualified'):
+            old = match.group('qualified')
+            feature = match.group('prefix').split('/', 1)[0]
+            new = MAPPINGS[feature].get(old)
+            if new is not None:
+                count += 1
+                return match.group('prefix') + new
+            # Not renamed in that feature; still a relative-path match for the current one
+            if old in local_mapping:
+                count += 1
+                return match.group('prefix') + local_mapping[old]
+            return match.group(0)
+
+        old = match.group('relative')
+        if old in local_mapping:
+            count += 1
+            return local_mapping[old]
+        return old
+
+    content = PATH_PATTERN.sub(replace, content)
+    return content, count > 0
+
+base_dir = r'd:\MyPOC\Angular\angular-features\src'
+extensions = ('.ts', '.html', '.css', '.scss')
+
+def feature_for_dir(root):
+    """Determine the current feature from a directory path"""
+    parts = root.split(os.sep)
+    if 'features' in parts:
+        feature_idx = parts.index('features')
+        if feature_idx + 1 < len(parts):
+            return parts[feature_idx + 1]
+    return None
+
+# Cheap byte-level check: every rewrite needs one of the old folder names
+PATH_PREFILTER = re.compile(
+    _alternation({old for mapping in MAPPINGS.values() for old in mapping}).encode('utf-8'))
 
 def main():
-    base_dir = r'd:\MyPOC\Angular\angular-features\src'
-    extensions = ('.ts', '.html', '.css', '.scss')
-    
     total_files = 0
     updated_files = 0
+    store = FingerprintStore('fix_imports', rules_version(MAPPINGS, PATH_PATTERN.pattern, extensions))
+    seen = []
     
     for root, dirs, files in os.walk(base_dir):
-        # Determine the current feature from the path
-        current_feature = None
-        parts = root.split(os.sep)
-        if 'features' in parts:
-            feature_idx = parts.index('features')
-            if feature_idx + 1 < len(parts):
-                current_feature = parts[feature_idx + 1]
+        current_feature = feature_for_dir(root)
 
         for file in files:
             if file.endswith(extensions):
                 total_files += 1
                 file_path = os.path.join(root, file)
+                seen.append(file_path)
                 
                 try:
+                    # Already processed by these rules and unchanged since: don't even open it
+                    if store.is_current(file_path):
+                        continue
+
+                    data = read_bytes(file_path)
+                    if not PATH_PREFILTER.search(data):
+                        store.record(file_path, data, store.encoding(file_path))
+                        continue
+
                     # Use utf-8 with fallback to latin-1 if needed
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                    except UnicodeDecodeError:
-                        with open(file_path, 'r', encoding='latin-1') as f:
-                            content = f.read()
-                    
+                    content, encoding = decode(data)
                     new_content, modified = fix_paths(content, current_feature)
                     
                     if modified:
@@ -136,9 +170,14 @@ def main():
                             f.write(new_content)
                         print(f"Updated: {file_path}")
                         updated_files += 1
+                        store.record(file_path, read_bytes(file_path), 'utf-8')
+                    else:
+                        store.record(file_path, data, encoding)
                 except Exception as e:
                     print(f"Error processing {file_path}: {e}")
                     
+    store.forget_missing(seen)
+    store.save()
     print(f"\nDone. Processed {total_files} files, updated {updated_files}.")
 
 if __name__ == "__main__":
@@ -0,0 +1,224 @@
+"""
+TypeScript import graph for src/app.
+
+Parses static `import ... from '...'` / `export ... from '...'` statements and
+dynamic `import('...')` calls (loadComponent / loadChildren routes) in every
+.ts file and keeps a persisted module graph. Only files whose size or mtime
+changed are re-parsed. Relative specifiers are resolved against the set of
+files on disk; package imports (@angular/core, rxjs, ...) are ignored.
+
+Usage:
+    python import_graph.py update
+    python import_graph.py unresolved
+    python import_graph.py rename app/features/input-output/components/use-case-1 [NEW_PATH]
+    python import_graph.py importers app/features/signals/signals.routes.ts
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import posixpath
+
+import fix_imports
+from index_guides import PRUNE_DIRS
+
+src_dir = fix_imports.base_dir
+graph_file = os.path.join(os.path.dirname(src_dir), ".import_graph.json")
+GRAPH_VERSION = 1
+
+STATIC_IMPORT_RE = re.compile(
+    r'''\b(?:import|export)\s+(?:type\s+)?(?:[\w*{}\s,$]+?\s+from\s+)?['"]([^'"\n]+)['"]''')
+DYNAMIC_IMPORT_RE = re.compile(r'''\bimport\(\s*['"]([^'"\n]+)['"]\s*\)''')
+
+# Comments, template literals and quoted strings, in source order
+NON_CODE_RE = re.compile(
+    r'//[^\n]*'
+    r'|/\*[\s\S]*?\*/'
+    r'|`(?:\\[\s\S]|[^\\`])*`'
+    r"""|'(?:\\.|[^\\'\n])*'"""
+    r'|"(?:\\.|[^\\"\n])*"')
+def _blank(match):
+    text = match.group(0)
+    # Keep string literals: specifiers live in them
+    if text[0] in '\'"':
+        return text
+    return ' ' + '\n' * text.count('\n')
+
+def blank_non_code(content):
+    """Drops comments and template literal bodies, keeping line numbers intact.
+
+    Component templates in this repo are full of example code such as
+    `import { X } from './x'`, which must not be treated as real imports.
+    """
+    return NON_CODE_RE.sub(_blank, content)
+
+def parse_imports(content):
+    """Returns [[specifier, line], ...] for every import in a TypeScript file"""
+    code = blank_non_code(content)
+    found = []
+    for pattern in (STATIC_IMPORT_RE, DYNAMIC_IMPORT_RE):
+        for match in pattern.finditer(code):
+            found.append([match.group(1), code.count('\n', 0, match.start(1)) + 1])
+    found.sort(key=lambda item: item[1])
+    return found
+
+def resolve(importer, spec, known_files):
+    """Resolves a relative specifier to a known file, or None.
+
+    Returns False for package imports, which are outside the graph.
+    """
+    if not spec.startswith('.'):
+        return False
+    base = posixpath.normpath(posixpath.join(posixpath.dirname(importer), spec))
+    for candidate in (base, base + '.ts', base + '/index.ts'):
+        if candidate in known_files:
+            return candidate
+    return None
+
+def list_files():
+    """Maps src-relative posix paths to (size, mtime) for every file under src/app"""
+    files = {}
+    app_dir = os.path.join(src_dir, 'app')
+    for root, dirs, names in os.walk(app_dir):
+        dirs[:] = [d for d in dirs if d not in PRUNE_DIRS]
+        for name in names:
+            full_path = os.path.join(root, name)
+            st = os.stat(full_path)
+            rel = os.path.relpath(full_path, src_dir).replace(os.sep, '/')
+            files[rel] = (st.st_size, st.st_mtime_ns)
+    return files
+
+def load_graph():
+    try:
+        with open(graph_file, 'r', encoding='utf-8') as f:
+            graph = json.load(f)
+    except (OSError, ValueError):
+        return {'version': GRAPH_VERSION, 'modules': {}}
+    if graph.get('version') != GRAPH_VERSION:
+        return {'version': GRAPH_VERSION, 'modules': {}}
+    return graph
+
+def update_graph(graph=None, save=True):
+    """Brings the persisted graph up to date, re-parsing only changed .ts files"""
+    graph = graph or load_graph()
+    modules = graph['modules']
+    files = list_files()
+
+    changed = 0
+    for rel, (size, mtime) in files.items():
+        if not rel.endswith('.ts'):
+            continue
+        entry = modules.get(rel)
+        if entry and entry['size'] == size and entry['mtime'] == mtime:
+            continue
+        try:
+            with open(os.path.join(src_dir, rel), 'r', encoding='utf-8') as f:
+                imports = parse_imports(f.read())
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error reading {rel}: {e}")
+            imports = []
+        modules[rel] = {'size': size, 'mtime': mtime, 'imports': imports}
+        changed += 1
+
+    removed = [rel for rel in modules if rel not in files]
+    for rel in removed:
+        del modules[rel]
+
+    graph['files'] = sorted(files)
+    if save and (changed or removed or not os.path.exists(graph_file)):
+        with open(graph_file, 'w', encoding='utf-8') as f:
+            json.dump(graph, f, separators=(',', ':'))
+    return graph, changed, len(removed)
+
+def edges(graph, known_files=None):
+    """Yields (importer, specifier, line, target) for every relative import"""
+    known_files = known_files if known_files is not None else set(graph['files'])
+    for importer, entry in graph['modules'].items():
+        for spec, line in entry['imports']:
+            target = resolve(importer, spec, known_files)
+            if target is not False:
+                yield importer, spec, line, target
+
+def unresolved(graph):
+    return [(importer, spec, line) for importer, spec, line, target in edges(graph) if target is None]
+
+def importers(graph, path):
+    """Every import whose target is `path` or lies inside it"""
+    prefix = path.rstrip('/') + '/'
+    return [
+        (importer, spec, line, target) for importer, spec, line, target in edges(graph)
+        if target and (target == path or target.startswith(prefix))
+    ]
+
+def rename_impact(graph, old, new=None):
+    """Imports that stop resolving if `old` (a file or folder) is moved to `new`.
+
+    Without `new`, every import pointing into `old` from outside it is
+    reported, since those specifiers have to be rewritten.
+    """
+    old = old.rstrip('/')
+    prefix = old + '/'
+
+    def moved(path):
+        if path == old:
+            return new
+        if path.startswith(prefix):
+            return new + path[len(old):]
+        return path
+
+    if new is None:
+        return [
+            (importer, spec, line, target) for importer, spec, line, target in importers(graph, old)
+            if not (importer == old or importer.startswith(prefix))
+        ]
+
+    new = new.rstrip('/')
+    before = set(graph['files'])
+    after = {moved(path) for path in before}
+    broken = []
+    for importer, entry in graph['modules'].items():
+        for spec, line in entry['imports']:
+            target = resolve(importer, spec, before)
+            if not target:
+                continue
+            if resolve(moved(importer), spec, after) != moved(target):
+                broken.append((importer, spec, line, target))
+    return broken
+
+def print_edges(rows, empty_message):
+    if not rows:
+        print(empty_message)
+        return
+    for row in rows:
+        importer, spec, line = row[:3]
+        target = f" -> {row[3]}" if len(row) > 3 and row[3] else ""
+        print(f"{importer}:{line}  '{spec}'{target}")
+    print(f"\n{len(rows)} import(s)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the TypeScript import graph of src/app")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("update", help="refresh the persisted graph")
+    sub.add_parser("unresolved", help="list relative imports that do not resolve")
+    rename = sub.add_parser("rename", help="what breaks if a file or folder is renamed")
+    rename.add_argument("old", help="src-relative path, e.g. app/features/signals/components/use-case-1")
+    rename.add_argument("new", nargs="?", help="simulate the move to this path")
+    who = sub.add_parser("importers", help="list imports of a file or folder")
+    who.add_argument("path")
+    args = parser.parse_args(argv)
+
+    graph, changed, removed = update_graph()
+    if args.command == "update":
+        print(f"Import graph: {len(graph['modules'])} modules ({changed} re-parsed, {removed} removed)")
+    elif args.command == "unresolved":
+        print_edges(unresolved(graph), "All relative imports resolve.")
+    elif args.command == "rename":
+        print_edges(rename_impact(graph, args.old, args.new), "Nothing breaks.")
+    elif args.command == "importers":
+        print_edges(importers(graph, args.path.rstrip('/')), "No importers.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,53 +1,140 @@
 import os
-import re
+import json
+from concurrent.futures import ThreadPoolExecutor
 
 features_dir = r"d:\MyPOC\Angular\angular-features\src\app\features"
 output_file = r"d:\MyPOC\Angular\angular-features\DOC_INDEX.md"
+cache_file = os.path.join(os.path.dirname(output_file), ".doc_index_cache.json")
+
+# Asset folders that never contain guides; pruned so we don't walk MP4s and PNGs
+PRUNE_DIRS = {'video-frames', 'v2_final', 'highlighted', 'old images', 'node_modules'}
+
+def find_guides(root_dir):
+    """Yields (full_path, stat) for every *guide.md, skipping asset directories"""
+    try:
+        entries = list(os.scandir(root_dir))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in PRUNE_DIRS:
+                yield from find_guides(entry.path)
+        elif entry.name.endswith("guide.md"):
+            yield entry.path, entry.stat()
+
+def read_title(full_path):
+    title = "No Title"
+    try:
+        with open(full_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith("# "):
+                    title = line.strip("# ").strip()
+                    break
+    except Exception as e:
+        title = f"Error reading file: {e}"
+    return title
+
+def guide_entry(full_path, title):
+    rel_path = os.path.relpath(full_path, features_dir)
+
+    # Extract feature name from path
+    parts = rel_path.split(os.sep)
+    feature = parts[0] if parts else "Unknown"
+
+    return {
+        "feature": feature,
+        "title": title,
+        "path": rel_path,
+        "full_path": full_path
+    }
+
+def load_cache():
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+
+def collect_guides(cache=None):
+    """Returns the sorted guide list, re-reading titles only for changed files.
+
+    The cache maps full_path -> {"size", "mtime", "title"} and is updated in place.
+    """
+    if cache is None:
+        cache = {}
+
+    found = list(find_guides(features_dir))
+    stale = [
+        path for path, st in found
+        if path not in cache
+        or cache[path]['size'] != st.st_size
+        or cache[path]['mtime'] != st.st_mtime_ns
+    ]
+
+    if stale:
+        with ThreadPoolExecutor() as pool:
+            titles = dict(zip(stale, pool.map(read_title, stale)))
+    else:
+        titles = {}
+
+    guides = []
+    for full_path, st in found:
+        if full_path in titles:
+            cache[full_path] = {"size": st.st_size, "mtime": st.st_mtime_ns, "title": titles[full_path]}
+        guides.append(guide_entry(full_path, cache[full_path]['title']))
+
+    # Forget guides that were deleted
+    for path in set(cache) - {path for path, _ in found}:
+        del cache[path]
+
+    return sort_guides(guides), len(stale)
+
+def sort_guides(guides):
+    # Sort by feature, then title
+    return sorted(guides, key=lambda x: (x['feature'], x['title']))
+
+def render_index(guides):
+    out = ["# 📚 Angular Features Documentation Index\n\n"]
+    out.append("A central directory of all concept guides and use-case documentation.\n\n")
 
-guides = []
-
-for root, dirs, files in os.walk(features_dir):
-    for file in files:
-        if file.endswith("guide.md"):
-            full_path = os.path.join(root, file)
-            rel_path = os.path.relpath(full_path, features_dir)
-            
-            title = "No Title"
-            try:
-                with open(full_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if line.startswith("# "):
-                            title = line.strip("# ").strip()
-                            break
-            except Exception as e:
-                title = f"Error reading file: {e}"
-            
-            # Extract feature name from path
-            parts = rel_path.split(os.sep)
-            feature = parts[0] if parts else "Unknown"
-            
-            guides.append({
-                "feature": feature,
-                "title": title,
-                "path": rel_path,
-                "full_path": full_path
-            })
-
-# Sort by feature, then title
-guides.sort(key=lambda x: (x['feature'], x['title']))
-
-with open(output_file, 'w', encoding='utf-8') as f:
-    f.write("# 📚 Angular Features Documentation Index\n\n")
-    f.write("A central directory of all concept guides and use-case documentation.\n\n")
-    
     current_feature = None
     for guide in guides:
         if guide['feature'] != current_feature:
             current_feature = guide['feature']
-            f.write(f"\n## {current_feature.replace('-', ' ').title()}\n\n")
-        
+            out.append(f"\n## {current_feature.replace('-', ' ').title()}\n\n")
+
         # Link using absolute file path for the environment
         file_link = f"file:///{guide['full_path'].replace(os.sep, '/')}"
-        f.write(f"- [{guide['title']}]({file_link})\n")
+        out.append(f"- [{guide['title']}]({file_link})\n")
+    return ''.join(out)
+
+def write_if_changed(path, content):
+    """Writes content only when it differs from what is on disk"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
+
+def build_index():
+    cache = load_cache()
+    guides, reread = collect_guides(cache)
+    save_cache(cache)
+
+    if write_if_changed(output_file, render_index(guides)):
+        print(f"Index generated at: {output_file} ({reread} guides re-read)")
+    else:
+        print(f"Index unchanged: {output_file} ({reread} guides re-read)")
+    return guides
 
-print(f"Index generated at: {output_file}")
+if __name__ == "__main__":
+    from search_guides import build_search_index
+    build_search_index(build_index())
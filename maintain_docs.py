@@ -0,0 +1,136 @@
+"""
+Single-pass maintenance engine for the source tree.
+
+Walks src once and runs every registered transform over each file in memory.
+A file is written at most once, atomically, and only if some transform
+changed it. The transforms are the same rules as add_toc_to_guides.py,
+refactor_content.py and fix_imports.py.
+
+Usage:
+    python maintain_docs.py                    # run every transform
+    python maintain_docs.py toc paths          # run a subset
+    python maintain_docs.py --dry-run
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+
+import add_toc_to_guides
+import fix_imports
+import refactor_content
+
+src_dir = fix_imports.base_dir
+
+# name -> (function(content, context) -> content, predicate(path) -> bool)
+TRANSFORMS = {}
+
+def register(name, applies_to):
+    """Registers a transform; transforms run in registration order"""
+    def decorator(func):
+        TRANSFORMS[name] = (func, applies_to)
+        return func
+    return decorator
+
+def in_features(path):
+    # A 'features' path segment, as in fix_imports.feature_for_dir, so --root trees match too
+    return 'features' in os.path.normpath(os.path.dirname(path)).split(os.sep)
+
+@register('paths', lambda path: path.endswith(fix_imports.extensions))
+def remap_paths(content, context):
+    new_content, _ = fix_imports.fix_paths(content, context['feature'])
+    return new_content
+
+@register('labels', lambda path: in_features(path) and path.endswith(tuple(refactor_content.file_exts)))
+def strip_labels(content, context):
+    return refactor_content.strip_use_case_labels(content)
+
+# Runs after label stripping so anchors are generated from the final headings
+@register('toc', lambda path: in_features(path) and os.path.basename(path) == 'guide.md')
+def toc(content, context):
+    return add_toc_to_guides.update_toc(content) or content
+
+def read_text(file_path):
+    # Use utf-8 with fallback to latin-1 if needed
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except UnicodeDecodeError:
+        with open(file_path, 'r', encoding='latin-1') as f:
+            return f.read()
+
+def write_atomic(file_path, content):
+    """Writes via a temp file in the same directory so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix='.maintain-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        # mkstemp creates the file as 0600; keep the original's permissions
+        shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def process_file(file_path, pipeline, context, dry_run=False):
+    """Runs the pipeline over one file; returns the names of transforms that changed it"""
+    content = read_text(file_path)
+    new_content = content
+    applied = []
+    for name, func in pipeline:
+        result = func(new_content, context)
+        if result != new_content:
+            applied.append(name)
+            new_content = result
+
+    if applied and not dry_run:
+        write_atomic(file_path, new_content)
+    return applied
+
+def run(names=None, root=None, dry_run=False):
+    names = names or list(TRANSFORMS)
+    selected = [(name, TRANSFORMS[name]) for name in TRANSFORMS if name in names]
+
+    total_files = 0
+    updated_files = 0
+    for dirpath, dirs, files in os.walk(root or src_dir):
+        context = {'feature': fix_imports.feature_for_dir(dirpath)}
+        for file in files:
+            file_path = os.path.join(dirpath, file)
+            pipeline = [(name, func) for name, (func, applies_to) in selected if applies_to(file_path)]
+            if not pipeline:
+                continue
+
+            total_files += 1
+            context['path'] = file_path
+            try:
+                applied = process_file(file_path, pipeline, context, dry_run)
+            except Exception as e:
+                print(f"Error processing {file_path}: {e}")
+                continue
+            if applied:
+                updated_files += 1
+                print(f"{'Would update' if dry_run else 'Updated'}: {file_path} ({', '.join(applied)})")
+
+    print(f"\nDone. Processed {total_files} files, updated {updated_files}.")
+    return updated_files
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the docs/source maintenance transforms in one pass")
+    parser.add_argument('transforms', nargs='*', metavar='transform',
+                        help=f"transforms to run (default: all of {', '.join(TRANSFORMS)})")
+    parser.add_argument('--root', help="directory to walk (default: src)")
+    parser.add_argument('--dry-run', action='store_true', help="report changes without writing")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.transforms if name not in TRANSFORMS]
+    if unknown:
+        parser.error(f"unknown transform(s): {', '.join(unknown)}")
+
+    run(args.transforms, args.root, args.dry_run)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,40 +1,67 @@
 import os
 import re
 
+from fingerprints import FingerprintStore, decode, read_bytes, rules_version
+
 features_dir = r"d:\MyPOC\Angular\angular-features\src\app\features"
 
 # Improved Regex for "Use Case X" variants including ranges and multiple numbers
 # Matches: "Use Case 1", "Use Case 4-7", "Use Case 1 & 2", "USE CASE 1:", etc.
 uc_pattern = r'(?i)Use Case\s+\d+([\s&\-,\d]+)?[:\-\s]*\s*'
 
-def process_file(file_path):
+# Files to process
+file_exts = ['.ts', '.html', '.md']
+
+def strip_use_case_labels(content):
+    return re.sub(uc_pattern, '', content)
+
+# Cheap byte-level check: every match of uc_pattern contains this
+uc_prefilter = re.compile(rb'(?i)use case')
+
+def process_file(file_path, store=None):
     try:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            with open(file_path, 'r', encoding='latin-1') as f:
-                content = f.read()
-            
-        new_content = re.sub(uc_pattern, '', content)
+        # Already processed by these rules and unchanged since: don't even open it
+        if store and store.is_current(file_path):
+            return False
+
+        data = read_bytes(file_path)
+        if not uc_prefilter.search(data):
+            if store:
+                store.record(file_path, data, store.encoding(file_path))
+            return False
+
+        # Use utf-8 with fallback to latin-1 if needed
+        content, encoding = decode(data)
+        new_content = strip_use_case_labels(content)
         
         if new_content != content:
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(new_content)
+            if store:
+                store.record(file_path, read_bytes(file_path), 'utf-8')
             return True
+        if store:
+            store.record(file_path, data, encoding)
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
     return False
 
-# Files to process
-file_exts = ['.ts', '.html', '.md']
-count = 0
+def main():
+    count = 0
+    store = FingerprintStore('refactor_content', rules_version(uc_pattern, file_exts))
+    seen = []
+
+    for root, dirs, files in os.walk(features_dir):
+        for file in files:
+            if any(file.endswith(ext) for ext in file_exts):
+                full_path = os.path.join(root, file)
+                seen.append(full_path)
+                if process_file(full_path, store):
+                    count += 1
 
-for root, dirs, files in os.walk(features_dir):
-    for file in files:
-        if any(file.endswith(ext) for ext in file_exts):
-            full_path = os.path.join(root, file)
-            if process_file(full_path):
-                count += 1
+    store.forget_missing(seen)
+    store.save()
+    print(f"Refactoring complete. Total files modified: {count}")
 
-print(f"Refactoring complete. Total files modified: {count}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Full-text search over the feature guides.
+
+Each guide is split into sections at its headings. Sections are indexed with
+heading-weighted term frequencies and ranked with BM25. The index is a single
+binary file that is memory-mapped at query time, so a lookup only touches the
+terms in the query.
+
+Usage:
+    python search_guides.py build
+    python search_guides.py query "signal inputs" -n 5
+
+    from search_guides import SearchIndex
+    with SearchIndex() as index:
+        hits = index.search("route guards")
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import mmap
+import heapq
+import struct
+import hashlib
+import argparse
+from collections import Counter, defaultdict
+
+import index_guides
+
+INDEX_FILE = os.path.join(os.path.dirname(index_guides.output_file), ".guide_search.idx")
+
+MAGIC = b"GSIX"
+VERSION = 1
+# magic, version, n_docs, n_terms, avg_doc_len, source signature, block offsets
+HEADER = struct.Struct("<4sIIIf20sIIII")
+TERM = struct.Struct("<IHII")      # term_off, term_len, postings_off, df
+POSTING = struct.Struct("<If")     # doc_id, weighted tf
+DOC = struct.Struct("<IIf")        # meta_off, meta_len, doc_len
+
+# Heading tokens count more than body text: a match in a title is a strong signal
+HEADING_WEIGHTS = {1: 4.0, 2: 3.0, 3: 2.0}
+DEFAULT_HEADING_WEIGHT = 1.5
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9_]*")
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)")
+TOC_HEADING = "📋 Table of Contents"
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "with", "you", "your",
+}
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+def split_sections(content):
+    """Yields (heading, level, line_no, body_lines) for each section of a guide"""
+    heading, level, line_no, body = "", 0, 1, []
+    in_fence = False
+    for i, line in enumerate(content.split("\n"), 1):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_RE.match(line)
+        if match:
+            if heading or any(b.strip() for b in body):
+                yield heading, level, line_no, body
+            heading, level, line_no, body = match.group(2).strip(), len(match.group(1)), i, []
+        else:
+            body.append(line)
+    if heading or any(b.strip() for b in body):
+        yield heading, level, line_no, body
+
+def index_guide(guide):
+    """Returns a list of (meta, weighted term counts) for every section of a guide"""
+    try:
+        with open(guide['full_path'], 'r', encoding='utf-8') as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading {guide['full_path']}: {e}")
+        return []
+
+    docs = []
+    for heading, level, line_no, body in split_sections(content):
+        # The generated TOC only repeats the other headings
+        if heading == TOC_HEADING:
+            continue
+        weight = HEADING_WEIGHTS.get(level, DEFAULT_HEADING_WEIGHT)
+        counts = Counter()
+        for token in tokenize(heading):
+            counts[token] += weight
+        for token in tokenize("\n".join(body)):
+            counts[token] += 1.0
+        if not counts:
+            continue
+        meta = {
+            "path": guide['path'],
+            "title": guide['title'],
+            "heading": heading,
+            "line": line_no,
+        }
+        docs.append((meta, counts))
+    return docs
+
+def source_signature(guides):
+    """Hash of every guide's path, size and mtime; unchanged means the index is current"""
+    h = hashlib.sha1()
+    for guide in sorted(guides, key=lambda g: g['full_path']):
+        try:
+            st = os.stat(guide['full_path'])
+        except OSError:
+            continue
+        h.update(f"{guide['full_path']}|{st.st_size}|{st.st_mtime_ns}\n".encode('utf-8'))
+    return h.digest()
+
+def read_signature(index_path):
+    try:
+        with open(index_path, 'rb') as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    magic, version, _, _, _, signature, *_ = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return signature
+
+def build_search_index(guides=None, index_path=INDEX_FILE, force=False):
+    """Builds the search index file; skipped when no guide changed since the last build"""
+    if guides is None:
+        guides, _ = index_guides.collect_guides(index_guides.load_cache())
+
+    signature = source_signature(guides)
+    if not force and read_signature(index_path) == signature:
+        print(f"Search index unchanged: {index_path}")
+        return False
+
+    postings = defaultdict(list)
+    doc_records = []
+    meta_blob = bytearray()
+    total_len = 0.0
+
+    for guide in guides:
+        for meta, counts in index_guide(guide):
+            doc_id = len(doc_records)
+            doc_len = sum(counts.values())
+            total_len += doc_len
+            encoded = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+            doc_records.append((len(meta_blob), len(encoded), doc_len))
+            meta_blob += encoded
+            for term, tf in counts.items():
+                postings[term].append((doc_id, tf))
+
+    terms = sorted(postings, key=lambda t: t.encode('utf-8'))
+    term_blob = bytearray()
+    term_records = []
+    posting_blob = bytearray()
+    for term in terms:
+        encoded = term.encode('utf-8')
+        term_records.append((len(term_blob), len(encoded), len(posting_blob), len(postings[term])))
+        term_blob += encoded
+        for doc_id, tf in postings[term]:
+            posting_blob += POSTING.pack(doc_id, tf)
+
+    # Layout: header | term table | doc table | postings | term strings | doc metadata
+    terms_off = HEADER.size
+    docs_off = terms_off + TERM.size * len(term_records)
+    postings_off = docs_off + DOC.size * len(doc_records)
+    strings_off = postings_off + len(posting_blob)
+    meta_off = strings_off + len(term_blob)
+
+    avg_len = total_len / len(doc_records) if doc_records else 0.0
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(doc_records), len(term_records), avg_len,
+                            signature, docs_off, postings_off, strings_off, meta_off))
+        for record in term_records:
+            f.write(TERM.pack(*record))
+        for record in doc_records:
+            f.write(DOC.pack(*record))
+        f.write(posting_blob)
+        f.write(term_blob)
+        f.write(meta_blob)
+    os.replace(tmp_path, index_path)
+
+    print(f"Search index built: {len(doc_records)} sections, {len(term_records)} terms -> {index_path}")
+    return True
+
+class SearchIndex:
+    """Read-only view over a search index file"""
+
+    def __init__(self, index_path=INDEX_FILE):
+        self._file = open(index_path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.n_docs, self.n_terms, self.avg_len, _,
+         self._docs_off, self._postings_off, self._strings_off, self._meta_off) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a search index (or outdated format): {index_path}")
+
+    def close(self):
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _term_at(self, i):
+        term_off, term_len, postings_off, df = TERM.unpack_from(self._mm, HEADER.size + i * TERM.size)
+        start = self._strings_off + term_off
+        return self._mm[start:start + term_len], postings_off, df
+
+    def _lookup(self, term):
+        """Binary search over the sorted term table"""
+        key = term.encode('utf-8')
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_term, postings_off, df = self._term_at(mid)
+            if mid_term < key:
+                lo = mid + 1
+            elif mid_term > key:
+                hi = mid
+            else:
+                return postings_off, df
+        return None
+
+    def _doc(self, doc_id):
+        return DOC.unpack_from(self._mm, self._docs_off + doc_id * DOC.size)
+
+    def _meta(self, doc_id):
+        meta_off, meta_len, _ = self._doc(doc_id)
+        start = self._meta_off + meta_off
+        return json.loads(self._mm[start:start + meta_len].decode('utf-8'))
+
+    def search(self, query, limit=10):
+        """Returns up to `limit` sections ranked by BM25, best first"""
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            found = self._lookup(term)
+            if not found:
+                continue
+            postings_off, df = found
+            idf = max(0.0, math.log((self.n_docs - df + 0.5) / (df + 0.5) + 1))
+            base = self._postings_off + postings_off
+            for k in range(df):
+                doc_id, tf = POSTING.unpack_from(self._mm, base + k * POSTING.size)
+                doc_len = self._doc(doc_id)[2]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / (self.avg_len or 1.0))
+                scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        hits = []
+        for doc_id, score in heapq.nlargest(limit, scores.items(), key=lambda item: item[1]):
+            meta = self._meta(doc_id)
+            meta['score'] = round(score, 3)
+            hits.append(meta)
+        return hits
+
+def search(query, limit=10, index_path=INDEX_FILE):
+    with SearchIndex(index_path) as index:
+        return index.search(query, limit)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search the Angular feature guides")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="build or refresh the search index")
+    build.add_argument("--force", action="store_true", help="rebuild even if no guide changed")
+
+    query = sub.add_parser("query", help="search the guides")
+    query.add_argument("terms", nargs="+")
+    query.add_argument("-n", "--limit", type=int, default=10)
+    query.add_argument("--json", action="store_true", help="print hits as JSON")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        build_search_index(force=args.force)
+        return 0
+
+    if not os.path.exists(INDEX_FILE):
+        print(f"No search index at {INDEX_FILE}; run 'python search_guides.py build' first.")
+        return 1
+
+    hits = search(" ".join(args.terms), args.limit, INDEX_FILE)
+    if args.json:
+        print(json.dumps(hits, ensure_ascii=False, indent=2))
+    elif not hits:
+        print("No matches.")
+    else:
+        for hit in hits:
+            section = f" > {hit['heading']}" if hit['heading'] else ""
+            print(f"{hit['score']:7.2f}  {hit['title']}{section}")
+            print(f"         {hit['path']}:{hit['line']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
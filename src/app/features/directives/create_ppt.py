@@ -8,11 +8,18 @@ from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 from pptx.enum.shapes import MSO_SHAPE
 import os
+from text_metrics import fit_font_size, split_to_fit, text_height
 
-# Create presentation with 16:9 aspect ratio
-prs = Presentation()
-prs.slide_width = Inches(13.333)
-prs.slide_height = Inches(7.5)
+# Deck the add_*_slide helpers append to, created by new_presentation()
+prs = None
+
+def new_presentation():
+    """Start a new presentation with 16:9 aspect ratio"""
+    global prs
+    prs = Presentation()
+    prs.slide_width = Inches(13.333)
+    prs.slide_height = Inches(7.5)
+    return prs
 
 def add_title_slide(title, subtitle=""):
     """Add a title slide"""
@@ -48,79 +55,129 @@ def add_title_slide(title, subtitle=""):
     
     return slide
 
-def add_content_slide(title, bullet_points):
-    """Add a content slide with bullet points"""
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    # Title bar
-    title_bar = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, Inches(1.2))
-    title_bar.fill.solid()
-    title_bar.line.fill.background()
-    
-    # Title text
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(0.7))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = title
-    p.font.size = Pt(36)
-    p.font.bold = True
-    
-    # Bullet points
-    content_box = slide.shapes.add_textbox(Inches(0.7), Inches(1.5), Inches(12), Inches(5.5))
-    tf = content_box.text_frame
-    tf.word_wrap = True
-    
-    for i, point in enumerate(bullet_points):
-        p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
-        p.text = "• " + point
-        p.font.size = Pt(24)
-        p.space_after = Pt(12)
-    
-    return slide
-
-def add_code_slide(title, code, description=""):
-    """Add a slide with code snippet"""
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    # Title bar
-    title_bar = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, Inches(1.2))
-    title_bar.fill.solid()
-    title_bar.line.fill.background()
-    
-    # Title text
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(0.7))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = title
-    p.font.size = Pt(32)
-    p.font.bold = True
-    
-    y_offset = 1.4
-    if description:
-        desc_box = slide.shapes.add_textbox(Inches(0.5), Inches(y_offset), Inches(12.333), Inches(0.5))
-        tf = desc_box.text_frame
+def warn_overflow(title, needed_pt, box_height_pt):
+    """Report text that will not fit in its box at build time"""
+    print(f"Warning: '{title}' overflows by ~{needed_pt - box_height_pt:.0f}pt")
+
+def add_content_slide(title, bullet_points, font_size=24, min_font_size=18):
+    """Add a content slide with bullet points
+
+    The font is shrunk down to min_font_size to fit the box; if the bullets
+    still overflow they are split across continuation slides.
+    """
+    box_width, box_height = 12 * 72, 5.5 * 72
+    paragraphs = ["• " + point for point in bullet_points]
+
+    size = fit_font_size(paragraphs, "Calibri", font_size, min_font_size, box_width, box_height, 12)
+    if size is None:
+        size = min_font_size
+        space_after = 12 * size / font_size
+        chunks = split_to_fit(paragraphs, "Calibri", size, box_width, box_height, space_after)
+        print(f"Note: '{title}' split across {len(chunks)} slides")
+    else:
+        space_after = 12 * size / font_size
+        chunks = [paragraphs]
+
+    first_slide = None
+    for chunk_idx, chunk in enumerate(chunks):
+        slide_layout = prs.slide_layouts[6]
+        slide = prs.slides.add_slide(slide_layout)
+        first_slide = first_slide or slide
+        
+        # Title bar
+        title_bar = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, Inches(1.2))
+        title_bar.fill.solid()
+        title_bar.line.fill.background()
+        
+        # Title text
+        title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(0.7))
+        tf = title_box.text_frame
         p = tf.paragraphs[0]
-        p.text = description
-        p.font.size = Pt(18)
-        p.font.italic = True
-        y_offset = 1.9
-    
-    # Code box
-    code_bg = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(0.4), Inches(y_offset), Inches(12.5), Inches(5.2))
-    code_bg.fill.solid()
-    code_bg.line.fill.background()
+        p.text = title if chunk_idx == 0 else f"{title} (cont.)"
+        p.font.size = Pt(36)
+        p.font.bold = True
+        
+        # Bullet points
+        content_box = slide.shapes.add_textbox(Inches(0.7), Inches(1.5), Inches(12), Inches(5.5))
+        tf = content_box.text_frame
+        tf.word_wrap = True
+        
+        for i, point in enumerate(chunk):
+            p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+            p.text = point
+            p.font.size = Pt(size)
+            p.space_after = Pt(space_after)
+
+        # A single bullet taller than the box cannot be split any further
+        needed = text_height(chunk, "Calibri", size, box_width, space_after)
+        if needed > box_height:
+            warn_overflow(title, needed, box_height)
     
-    code_box = slide.shapes.add_textbox(Inches(0.6), Inches(y_offset + 0.2), Inches(12.1), Inches(4.8))
-    tf = code_box.text_frame
-    tf.word_wrap = True
-    p = tf.paragraphs[0]
-    p.text = code
-    p.font.size = Pt(13)
-    p.font.name = "Consolas"
+    return first_slide
+
+def add_code_slide(title, code, description="", font_size=13, min_font_size=10):
+    """Add a slide with code snippet
+
+    The code font is shrunk down to min_font_size to fit the box; longer
+    snippets are split by line across continuation slides.
+    """
+    y_offset = 1.9 if description else 1.4
+    box_width, box_height = 12.1 * 72, 4.8 * 72
+    code_lines = code.split('\n')
+
+    size = fit_font_size(code_lines, "Consolas", font_size, min_font_size, box_width, box_height)
+    if size is None:
+        size = min_font_size
+        chunks = split_to_fit(code_lines, "Consolas", size, box_width, box_height)
+        print(f"Note: '{title}' split across {len(chunks)} slides")
+    else:
+        chunks = [code_lines]
+
+    first_slide = None
+    for chunk_idx, chunk in enumerate(chunks):
+        slide_layout = prs.slide_layouts[6]
+        slide = prs.slides.add_slide(slide_layout)
+        first_slide = first_slide or slide
+        
+        # Title bar
+        title_bar = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, Inches(1.2))
+        title_bar.fill.solid()
+        title_bar.line.fill.background()
+        
+        # Title text
+        title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(0.7))
+        tf = title_box.text_frame
+        p = tf.paragraphs[0]
+        p.text = title if chunk_idx == 0 else f"{title} (cont.)"
+        p.font.size = Pt(32)
+        p.font.bold = True
+        
+        if description:
+            desc_box = slide.shapes.add_textbox(Inches(0.5), Inches(1.4), Inches(12.333), Inches(0.5))
+            tf = desc_box.text_frame
+            p = tf.paragraphs[0]
+            p.text = description
+            p.font.size = Pt(18)
+            p.font.italic = True
+        
+        # Code box
+        code_bg = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(0.4), Inches(y_offset), Inches(12.5), Inches(5.2))
+        code_bg.fill.solid()
+        code_bg.line.fill.background()
+        
+        code_box = slide.shapes.add_textbox(Inches(0.6), Inches(y_offset + 0.2), Inches(12.1), Inches(4.8))
+        tf = code_box.text_frame
+        tf.word_wrap = True
+        p = tf.paragraphs[0]
+        p.text = '\n'.join(chunk)
+        p.font.size = Pt(size)
+        p.font.name = "Consolas"
+
+        needed = text_height(chunk, "Consolas", size, box_width)
+        if needed > box_height:
+            warn_overflow(title, needed, box_height)
     
-    return slide
+    return first_slide
 
 def add_two_column_slide(title, left_content, right_content, left_title="", right_title=""):
     """Add a two-column slide"""
@@ -230,40 +287,44 @@ def add_table_slide(title, headers, rows):
 # CREATE SLIDES
 # ============================================================================
 
-# Slide 1: Title
-add_title_slide("Angular Directives", "A Complete Guide to Building Powerful, Reusable Behaviors")
-
-# Slide 2: Agenda
-add_content_slide("Agenda", [
-    "What Are Directives?",
-    "Three Types of Directives",
-    "Attribute Directives - Changing Appearance & Behavior",
-    "Structural Directives - Manipulating the DOM",
-    "Key APIs: ElementRef, Renderer2, TemplateRef, ViewContainerRef",
-    "@HostListener & @HostBinding",
-    "Real-World Production Patterns",
-    "Best Practices & Performance Tips"
-])
-
-# Slide 3: What Are Directives
-add_content_slide("What Are Directives?", [
-    "Directives are classes that add behavior to elements in Angular",
-    'Think of them as "HTML attribute superpowers"',
-    "They extend what HTML elements can do!",
-    "Built-in examples: *ngIf, *ngFor, [ngClass], [ngStyle]",
-    "Custom directives let you create reusable behaviors"
-])
-
-# Slide 4: Three Types
-add_table_slide("Three Types of Directives", ["Type", "Description", "Example"], [
-    ["Components", "Directives with a template", "@Component"],
-    ["Attribute", "Modify appearance/behavior", "[ngClass], [ngStyle]"],
-    ["Structural", "Add/remove DOM elements", "*ngIf, *ngFor"]
-])
-
-# Slide 5: Simple Attribute Directive
-add_code_slide("Simple Attribute Directive",
-'''@Directive({
+def build_presentation(output_path=None):
+    """Builds every slide and saves the deck next to this script"""
+    new_presentation()
+
+    # Slide 1: Title
+    add_title_slide("Angular Directives", "A Complete Guide to Building Powerful, Reusable Behaviors")
+
+    # Slide 2: Agenda
+    add_content_slide("Agenda", [
+        "What Are Directives?",
+        "Three Types of Directives",
+        "Attribute Directives - Changing Appearance & Behavior",
+        "Structural Directives - Manipulating the DOM",
+        "Key APIs: ElementRef, Renderer2, TemplateRef, ViewContainerRef",
+        "@HostListener & @HostBinding",
+        "Real-World Production Patterns",
+        "Best Practices & Performance Tips"
+    ])
+
+    # Slide 3: What Are Directives
+    add_content_slide("What Are Directives?", [
+        "Directives are classes that add behavior to elements in Angular",
+        'Think of them as "HTML attribute superpowers"',
+        "They extend what HTML elements can do!",
+        "Built-in examples: *ngIf, *ngFor, [ngClass], [ngStyle]",
+        "Custom directives let you create reusable behaviors"
+    ])
+
+    # Slide 4: Three Types
+    add_table_slide("Three Types of Directives", ["Type", "Description", "Example"], [
+        ["Components", "Directives with a template", "@Component"],
+        ["Attribute", "Modify appearance/behavior", "[ngClass], [ngStyle]"],
+        ["Structural", "Add/remove DOM elements", "*ngIf, *ngFor"]
+    ])
+
+    # Slide 5: Simple Attribute Directive
+    add_code_slide("Simple Attribute Directive",
+    '''@Directive({
     selector: '[appHighlight]',
     standalone: true
 })
@@ -281,11 +342,11 @@ export class HighlightDirective implements OnInit {
 }
 
 // Usage: <span appHighlight>Highlighted!</span>''',
-"Creating a simple directive that highlights elements")
+    "Creating a simple directive that highlights elements")
 
-# Slide 6: Directive with @Input
-add_code_slide("Configurable Directive with @Input",
-'''@Directive({ selector: '[appHighlight]', standalone: true })
+    # Slide 6: Directive with @Input
+    add_code_slide("Configurable Directive with @Input",
+    '''@Directive({ selector: '[appHighlight]', standalone: true })
 export class HighlightDirective {
     private el = inject(ElementRef);
     private renderer = inject(Renderer2);
@@ -301,17 +362,17 @@ export class HighlightDirective {
 
 // <p [appHighlight]="'yellow'">Yellow</p>
 // <p [appHighlight]="'lightblue'">Blue</p>''',
-"Making directives flexible with @Input")
+    "Making directives flexible with @Input")
 
-# Slide 7: Key APIs
-add_two_column_slide("Key APIs: ElementRef & Renderer2",
-    ["Provides direct access to host element", "el.nativeElement gives DOM element", "Direct access - use carefully!", "May not work in SSR"],
-    ["Platform-agnostic DOM operations", "setStyle(), addClass(), removeClass()", "setAttribute(), listen()", "Safe for SSR & Web Workers"],
-    "ElementRef - Direct DOM Access", "Renderer2 - Safe DOM Manipulation")
+    # Slide 7: Key APIs
+    add_two_column_slide("Key APIs: ElementRef & Renderer2",
+        ["Provides direct access to host element", "el.nativeElement gives DOM element", "Direct access - use carefully!", "May not work in SSR"],
+        ["Platform-agnostic DOM operations", "setStyle(), addClass(), removeClass()", "setAttribute(), listen()", "Safe for SSR & Web Workers"],
+        "ElementRef - Direct DOM Access", "Renderer2 - Safe DOM Manipulation")
 
-# Slide 8: @HostListener
-add_code_slide("@HostListener - Responding to Events",
-'''@Directive({ selector: '[appHoverEffect]', standalone: true })
+    # Slide 8: @HostListener
+    add_code_slide("@HostListener - Responding to Events",
+    '''@Directive({ selector: '[appHoverEffect]', standalone: true })
 export class HoverEffectDirective {
     private el = inject(ElementRef);
     private renderer = inject(Renderer2);
@@ -328,11 +389,11 @@ export class HoverEffectDirective {
         this.renderer.removeStyle(this.el.nativeElement, 'backgroundColor');
     }
 }''',
-"Listen to host element events declaratively")
+    "Listen to host element events declaratively")
 
-# Slide 9: @HostBinding
-add_code_slide("@HostBinding - Binding Properties",
-'''@Directive({ selector: '[appActiveToggle]', standalone: true })
+    # Slide 9: @HostBinding
+    add_code_slide("@HostBinding - Binding Properties",
+    '''@Directive({ selector: '[appActiveToggle]', standalone: true })
 export class ActiveToggleDirective {
     private isActive = false;
 
@@ -347,26 +408,26 @@ export class ActiveToggleDirective {
     @HostListener('click')
     toggle(): void { this.isActive = !this.isActive; }
 }''',
-"Bind host element properties and attributes")
-
-# Slide 10: Structural Directives
-add_content_slide("Structural Directives", [
-    "Change the DOM structure by adding/removing elements",
-    "Prefixed with asterisk (*) - syntactic sugar",
-    "*ngIf='condition' expands to <ng-template [ngIf]='condition'>",
-    "Key APIs: TemplateRef (blueprint) + ViewContainerRef (slot)",
-    "createEmbeddedView() to stamp, clear() to remove"
-])
-
-# Slide 11: TemplateRef & ViewContainerRef
-add_two_column_slide("TemplateRef & ViewContainerRef",
-    ["The 'Rubber Stamp'", "Holds the template blueprint", "Contains HTML inside *directive", "Doesn't render by itself"],
-    ["The 'Slot on Page'", "Location to render template", "createEmbeddedView(templateRef)", "clear() removes all views"],
-    "TemplateRef<T>", "ViewContainerRef")
-
-# Slide 12: Custom *appIf
-add_code_slide("Custom Structural Directive: *appIf",
-'''@Directive({ selector: '[appIf]', standalone: true })
+    "Bind host element properties and attributes")
+
+    # Slide 10: Structural Directives
+    add_content_slide("Structural Directives", [
+        "Change the DOM structure by adding/removing elements",
+        "Prefixed with asterisk (*) - syntactic sugar",
+        "*ngIf='condition' expands to <ng-template [ngIf]='condition'>",
+        "Key APIs: TemplateRef (blueprint) + ViewContainerRef (slot)",
+        "createEmbeddedView() to stamp, clear() to remove"
+    ])
+
+    # Slide 11: TemplateRef & ViewContainerRef
+    add_two_column_slide("TemplateRef & ViewContainerRef",
+        ["The 'Rubber Stamp'", "Holds the template blueprint", "Contains HTML inside *directive", "Doesn't render by itself"],
+        ["The 'Slot on Page'", "Location to render template", "createEmbeddedView(templateRef)", "clear() removes all views"],
+        "TemplateRef<T>", "ViewContainerRef")
+
+    # Slide 12: Custom *appIf
+    add_code_slide("Custom Structural Directive: *appIf",
+    '''@Directive({ selector: '[appIf]', standalone: true })
 export class AppIfDirective implements OnChanges {
     private templateRef = inject(TemplateRef<any>);
     private viewContainer = inject(ViewContainerRef);
@@ -383,11 +444,11 @@ export class AppIfDirective implements OnChanges {
         }
     }
 }''',
-"Building your own *ngIf equivalent")
+    "Building your own *ngIf equivalent")
 
-# Slide 13: Permission Directive
-add_code_slide("Real-World: Permission-Based Visibility",
-'''@Directive({ selector: '[appPermission]', standalone: true })
+    # Slide 13: Permission Directive
+    add_code_slide("Real-World: Permission-Based Visibility",
+    '''@Directive({ selector: '[appPermission]', standalone: true })
 export class PermissionDirective implements OnInit {
     private templateRef = inject(TemplateRef<any>);
     private viewContainer = inject(ViewContainerRef);
@@ -404,11 +465,11 @@ export class PermissionDirective implements OnInit {
     }
 }
 // <button *appPermission="['admin']">Delete</button>''',
-"Role-based access control in templates")
+    "Role-based access control in templates")
 
-# Slide 14: Lazy Load
-add_code_slide("Real-World: Lazy Load Images",
-'''@Directive({ selector: '[appLazyLoad]', standalone: true })
+    # Slide 14: Lazy Load
+    add_code_slide("Real-World: Lazy Load Images",
+    '''@Directive({ selector: '[appLazyLoad]', standalone: true })
 export class LazyLoadDirective implements AfterViewInit {
     private el = inject(ElementRef);
     private observer: IntersectionObserver | null = null;
@@ -426,49 +487,53 @@ export class LazyLoadDirective implements AfterViewInit {
         this.observer.observe(this.el.nativeElement);
     }
 }''',
-"Load images only when they enter viewport")
-
-# Slide 15: Directive Catalog
-add_table_slide("Directive Catalog Summary", ["Directive", "Type", "Use Case"], [
-    ["[appHighlight]", "Attribute", "Apply background color"],
-    ["[appHoverEffect]", "Attribute", "Mouse hover effects"],
-    ["[appCopyToClipboard]", "Attribute", "Copy text on click"],
-    ["[appDebounceClick]", "Attribute", "Prevent double clicks"],
-    ["[appLazyLoad]", "Attribute", "Lazy load images"],
-    ["*appIf", "Structural", "Conditional rendering"],
-    ["*appPermission", "Structural", "Role-based visibility"]
-])
-
-# Slide 16: Best Practices
-add_two_column_slide("Best Practices",
-    ["Use Renderer2 for DOM (SSR-safe)", "Use inject() for DI", "Clean up in ngOnDestroy", "Use @Input setters for reactivity", "Keep directives focused", "Use standalone: true"],
-    ["Direct nativeElement for styling", "Forget to unsubscribe", "Create multi-purpose directives", "Use directives when component fits", "Ignore memory leaks", "Skip error handling"],
-    "DO", "DON'T")
-
-# Slide 17: Lifecycle Hooks
-add_table_slide("Lifecycle Hook Selection", ["Hook", "Use When"], [
-    ["constructor()", "Dependencies ready, no inputs needed"],
-    ["ngOnInit()", "Inputs ready, set up logic/listeners"],
-    ["ngOnChanges()", "React to input changes"],
-    ["ngAfterViewInit()", "DOM fully rendered, focus/scroll"],
-    ["ngOnDestroy()", "Cleanup observers/listeners"]
-])
-
-# Slide 18: Key Takeaways
-add_content_slide("Key Takeaways", [
-    "Directives extend HTML with custom behaviors",
-    "Attribute directives modify appearance/behavior",
-    "Structural directives change DOM structure",
-    "Use Renderer2 for safe DOM manipulation",
-    "TemplateRef + ViewContainerRef = Structural magic",
-    "@HostListener for events, @HostBinding for properties",
-    "Always clean up in ngOnDestroy!"
-])
-
-# Slide 19: Thank You
-add_title_slide("Thank You!", "Directives are the secret sauce that makes Angular templates powerful.")
-
-# Save
-output_path = os.path.join(os.path.dirname(__file__), "Angular_Directives_Presentation.pptx")
-prs.save(output_path)
-print(f"Presentation saved to: {output_path}")
+    "Load images only when they enter viewport")
+
+    # Slide 15: Directive Catalog
+    add_table_slide("Directive Catalog Summary", ["Directive", "Type", "Use Case"], [
+        ["[appHighlight]", "Attribute", "Apply background color"],
+        ["[appHoverEffect]", "Attribute", "Mouse hover effects"],
+        ["[appCopyToClipboard]", "Attribute", "Copy text on click"],
+        ["[appDebounceClick]", "Attribute", "Prevent double clicks"],
+        ["[appLazyLoad]", "Attribute", "Lazy load images"],
+        ["*appIf", "Structural", "Conditional rendering"],
+        ["*appPermission", "Structural", "Role-based visibility"]
+    ])
+
+    # Slide 16: Best Practices
+    add_two_column_slide("Best Practices",
+        ["Use Renderer2 for DOM (SSR-safe)", "Use inject() for DI", "Clean up in ngOnDestroy", "Use @Input setters for reactivity", "Keep directives focused", "Use standalone: true"],
+        ["Direct nativeElement for styling", "Forget to unsubscribe", "Create multi-purpose directives", "Use directives when component fits", "Ignore memory leaks", "Skip error handling"],
+        "DO", "DON'T")
+
+    # Slide 17: Lifecycle Hooks
+    add_table_slide("Lifecycle Hook Selection", ["Hook", "Use When"], [
+        ["constructor()", "Dependencies ready, no inputs needed"],
+        ["ngOnInit()", "Inputs ready, set up logic/listeners"],
+        ["ngOnChanges()", "React to input changes"],
+        ["ngAfterViewInit()", "DOM fully rendered, focus/scroll"],
+        ["ngOnDestroy()", "Cleanup observers/listeners"]
+    ])
+
+    # Slide 18: Key Takeaways
+    add_content_slide("Key Takeaways", [
+        "Directives extend HTML with custom behaviors",
+        "Attribute directives modify appearance/behavior",
+        "Structural directives change DOM structure",
+        "Use Renderer2 for safe DOM manipulation",
+        "TemplateRef + ViewContainerRef = Structural magic",
+        "@HostListener for events, @HostBinding for properties",
+        "Always clean up in ngOnDestroy!"
+    ])
+
+    # Slide 19: Thank You
+    add_title_slide("Thank You!", "Directives are the secret sauce that makes Angular templates powerful.")
+
+    # Save
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(__file__), "Angular_Directives_Presentation.pptx")
+    prs.save(output_path)
+    print(f"Presentation saved to: {output_path}")
+
+if __name__ == "__main__":
+    build_presentation()
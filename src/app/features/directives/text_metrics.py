@@ -0,0 +1,122 @@
+"""
+Text Metrics for the PowerPoint Generators
+Estimates wrapped line counts and text heights from per-font glyph width
+tables, so slides can be fitted without launching PowerPoint or LibreOffice.
+"""
+
+from functools import lru_cache
+
+# Widths are in em units (fraction of the font size). The tables are
+# approximations of the real fonts, good enough to predict wrapping.
+DEFAULT_FONT = "Calibri"
+MONOSPACE_FONTS = {"Consolas": 0.55, "Courier New": 0.6}
+
+PROPORTIONAL_CLASSES = {
+    "Calibri": [
+        (" ", 0.226),
+        ("il.,:;!|'`", 0.23),
+        ("fjrtI()[]{}\"-", 0.33),
+        ("abcdeghknopqsuvxyz", 0.49),
+        ("0123456789", 0.507),
+        ("ABCDEFGHJKLNOPQRSTUVXYZ", 0.58),
+        ("mwMW", 0.8),
+        ("<>=+*#$%&@/\\_~^?", 0.5),
+    ],
+}
+
+LINE_SPACING = 1.2          # Line height as a multiple of the font size
+BOX_MARGIN_X_PT = 7.2 * 2   # python-pptx default left + right inset (0.1in each)
+BOX_MARGIN_Y_PT = 3.6 * 2   # python-pptx default top + bottom inset (0.05in each)
+
+
+@lru_cache(maxsize=None)
+def glyph_widths(font_name):
+    """Returns (table, fallback) where table maps a character to its width in em"""
+    if font_name in MONOSPACE_FONTS:
+        return {}, MONOSPACE_FONTS[font_name]
+
+    table = {}
+    for chars, width in PROPORTIONAL_CLASSES.get(font_name, PROPORTIONAL_CLASSES[DEFAULT_FONT]):
+        for ch in chars:
+            table[ch] = width
+    # Emojis and other wide glyphs are roughly square
+    return table, 0.55
+
+
+@lru_cache(maxsize=4096)
+def text_width(text, font_name, size_pt):
+    """Width of a single unwrapped line of text in points"""
+    table, fallback = glyph_widths(font_name)
+    if not table:
+        return len(text) * fallback * size_pt
+    em = 0.0
+    for ch in text:
+        width = table.get(ch)
+        if width is None:
+            width = 1.0 if ord(ch) > 0x2000 and ch != "•" else fallback
+        em += width
+    return em * size_pt
+
+
+def wrap_line_count(text, font_name, size_pt, box_width_pt):
+    """Number of lines the text occupies after greedy word wrapping"""
+    usable = box_width_pt - BOX_MARGIN_X_PT
+    space = text_width(" ", font_name, size_pt)
+    lines = 0
+
+    for raw_line in text.split("\n"):
+        lines += 1
+        current = 0.0
+        for word in raw_line.split(" "):
+            word_w = text_width(word, font_name, size_pt)
+            if current and current + space + word_w > usable:
+                lines += 1
+                current = 0.0
+            elif current:
+                current += space
+            # Words longer than the box are broken mid-word
+            while word_w > usable:
+                lines += 1
+                word_w -= usable
+            current += word_w
+    return lines
+
+
+def text_height(paragraphs, font_name, size_pt, box_width_pt, space_after_pt=0):
+    """Estimated height in points of a list of paragraphs"""
+    height = BOX_MARGIN_Y_PT
+    for i, para in enumerate(paragraphs):
+        height += wrap_line_count(para, font_name, size_pt, box_width_pt) * size_pt * LINE_SPACING
+        if i < len(paragraphs) - 1:
+            height += space_after_pt
+    return height
+
+
+def fits(paragraphs, font_name, size_pt, box_width_pt, box_height_pt, space_after_pt=0):
+    return text_height(paragraphs, font_name, size_pt, box_width_pt, space_after_pt) <= box_height_pt
+
+
+def fit_font_size(paragraphs, font_name, max_size, min_size, box_width_pt, box_height_pt,
+                  space_after_pt=0):
+    """Largest whole point size between max_size and min_size that fits, or None"""
+    for size in range(int(max_size), int(min_size) - 1, -1):
+        scale = size / max_size
+        if fits(paragraphs, font_name, size, box_width_pt, box_height_pt, space_after_pt * scale):
+            return size
+    return None
+
+
+def split_to_fit(paragraphs, font_name, size_pt, box_width_pt, box_height_pt, space_after_pt=0):
+    """Splits paragraphs into consecutive chunks that each fit in the box"""
+    chunks = []
+    current = []
+    for para in paragraphs:
+        candidate = current + [para]
+        if current and not fits(candidate, font_name, size_pt, box_width_pt, box_height_pt, space_after_pt):
+            chunks.append(current)
+            current = [para]
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
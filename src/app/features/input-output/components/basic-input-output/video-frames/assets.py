@@ -0,0 +1,135 @@
+"""
+Preflight image resolution for the video-frames builders.
+
+Script entries name an image either by a path relative to this folder or by
+its bare file name. Instead of probing os.path.exists per segment, the
+candidate directories are listed once into an index and every segment is
+resolved against it before any TTS, rendering or slide building starts, so a
+missing image is reported up front rather than minutes into a render.
+"""
+
+import os
+import difflib
+import PIL.Image
+from highlights import parse_highlights, check_regions
+
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
+
+# Searched in order: this folder, the final frames, the highlight overlays,
+# then the feature folder the video belongs to
+ASSET_DIRS = ('', 'v2_final', 'highlighted', os.pardir)
+
+def split_images(image_field):
+    # Multi-image entries: "img1.png, img2.png"
+    return [img.strip() for img in image_field.split(',') if img.strip()]
+
+class AssetIndex:
+    """Every image in the candidate directories, listed once"""
+
+    def __init__(self, dirs=ASSET_DIRS):
+        self.paths = {}    # normcased relative path -> path
+        self.by_name = {}  # lowercase file name -> path in the first directory that has it
+        for directory in dirs:
+            try:
+                entries = list(os.scandir(directory or os.curdir))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.name.lower().endswith(IMAGE_EXTS) or not entry.is_file():
+                    continue
+                path = os.path.join(directory, entry.name) if directory else entry.name
+                self.paths[os.path.normcase(os.path.normpath(path))] = path
+                self.by_name.setdefault(entry.name.lower(), path)
+
+    def resolve(self, name):
+        """Path of the image a script entry refers to, or None.
+
+        A bare file name is looked up in every directory; a name with a
+        directory must exist in that directory, so "v2_final/x.png" is not
+        quietly replaced by "highlighted/x.png" (suggest offers that instead).
+        """
+        key = os.path.normcase(os.path.normpath(name))
+        if key in self.paths:
+            return self.paths[key]
+        if not os.path.dirname(key):
+            return self.by_name.get(key.lower())
+        # A directory outside the index (e.g. "old images/x.png")
+        if os.path.isfile(name):
+            return name
+        return None
+
+    def suggest(self, name):
+        """The same file name in another directory, else the closest name"""
+        base = os.path.basename(os.path.normpath(name)).lower()
+        if base in self.by_name:
+            return self.by_name[base]
+        matches = difflib.get_close_matches(base, self.by_name, n=1, cutoff=0.6)
+        return self.by_name[matches[0]] if matches else None
+
+def preflight(segments, index=None):
+    """Resolves every segment's images in one pass.
+
+    Sets seg['images'] to the resolved paths and returns a list of
+    (segment number, image name, suggestion) for the images that are missing.
+    """
+    index = index or AssetIndex()
+    missing = []
+    for n, seg in enumerate(segments, 1):
+        seg['images'] = []
+        for name in split_images(seg['image']):
+            path = index.resolve(name)
+            if path:
+                seg['images'].append(path)
+            else:
+                missing.append((n, name, index.suggest(name)))
+        if not split_images(seg['image']):
+            missing.append((n, seg['image'], None))
+    return missing
+
+def prepare_highlights(segments, index=None):
+    """Parses every segment's highlight line into seg['highlights'], resolving masks.
+
+    Returns report lines for lines that cannot be read, rectangles that do
+    not fit the segment's images (as resolved by preflight) and masks that
+    are missing.
+    """
+    index = index or AssetIndex()
+    problems = []
+    for n, seg in enumerate(segments, 1):
+        seg['highlights'] = []
+        try:
+            regions = parse_highlights(seg.get('highlight'))
+            for img_path in seg.get('images', []) if regions else []:
+                # Only the header is read
+                with PIL.Image.open(img_path) as img:
+                    check_regions(regions, img.size)
+        except ValueError as e:
+            problems.append(f"Segment {n}: bad highlight {e}")
+            continue
+        for region in regions:
+            if region['mask']:
+                path = index.resolve(region['mask'])
+                if not path:
+                    problems.extend(format_report([(n, region['mask'], index.suggest(region['mask']))]))
+                    continue
+                region['mask'] = path
+            seg['highlights'].append(region)
+    return problems
+
+def format_report(missing):
+    lines = []
+    for n, name, suggestion in missing:
+        hint = f" (did you mean {suggestion}?)" if suggestion else ""
+        lines.append(f"Segment {n}: image not found: {name}{hint}")
+    return lines
+
+def check_assets(segments):
+    """Preflight with a printed report; False if any image is missing or a highlight is unreadable"""
+    index = AssetIndex()
+    problems = format_report(preflight(segments, index)) + prepare_highlights(segments, index)
+    if problems:
+        for line in problems:
+            print(line)
+        print(f"Preflight failed: {len(problems)} problem(s) with images or highlights. Nothing was rendered.")
+        return False
+    return True
@@ -0,0 +1,113 @@
+import subprocess
+import numpy as np
+from captions import ffmpeg_binary
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+
+# Loudness target for narration, in LUFS (EBU R128 for speech-only content)
+TARGET_LUFS = -16.0
+# Never push peaks above this, in dBFS
+PEAK_CEILING_DB = -1.0
+# Anything quieter than this, relative to the loudest 10ms frame, counts as silence
+SILENCE_DB = -45.0
+FRAME_SECONDS = 0.010
+# Padding kept around the speech after trimming
+LEAD_PAD = 0.05
+TAIL_PAD = 0.15
+
+def decode_audio(audio_file, fps=SAMPLE_RATE, channels=CHANNELS):
+    """Decodes a file once into a float32 (n_samples, channels) array in [-1, 1]"""
+    cmd = [
+        ffmpeg_binary(), '-loglevel', 'error', '-i', audio_file,
+        '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', str(channels), '-ar', str(fps), '-'
+    ]
+    raw = subprocess.run(cmd, capture_output=True, check=True).stdout
+    samples = np.frombuffer(raw, dtype=np.int16).reshape(-1, channels)
+    return samples.astype(np.float32) / 32768.0
+
+def to_db(power):
+    return 10.0 * np.log10(np.maximum(power, 1e-12))
+
+def integrated_loudness(samples, fps=SAMPLE_RATE):
+    """Gated loudness (BS.1770 gating on 400ms blocks, 75% overlap).
+
+    The K-weighting pre-filter is left out: it needs an IIR filter, and for
+    speech from a single TTS engine the plain gated measure ranks clips the
+    same way, which is all the normalisation needs.
+    """
+    power = np.mean(samples ** 2, axis=1)
+    block, hop = int(0.4 * fps), int(0.1 * fps)
+    if len(power) < block:
+        return to_db(np.mean(power)) - 0.691 if len(power) else -70.0
+
+    # Mean power of every block via a cumulative sum: no Python loop
+    csum = np.concatenate(([0.0], np.cumsum(power, dtype=np.float64)))
+    starts = np.arange(0, len(power) - block + 1, hop)
+    block_power = (csum[starts + block] - csum[starts]) / block
+    block_lufs = -0.691 + to_db(block_power)
+
+    gated = block_power[block_lufs > -70.0]
+    if not len(gated):
+        return -70.0
+    relative_gate = -0.691 + to_db(np.mean(gated)) - 10.0
+    gated = block_power[(block_lufs > -70.0) & (block_lufs > relative_gate)]
+    return float(-0.691 + to_db(np.mean(gated)))
+
+def speech_bounds(samples, fps=SAMPLE_RATE):
+    """(start, end) sample indices of the non-silent part, padded"""
+    frame = max(1, int(FRAME_SECONDS * fps))
+    n_frames = len(samples) // frame
+    if n_frames == 0:
+        return 0, len(samples)
+
+    frame_power = np.mean(samples[:n_frames * frame].reshape(n_frames, frame, -1) ** 2, axis=(1, 2))
+    frame_db = to_db(frame_power)
+    voiced = np.flatnonzero(frame_db > frame_db.max() + SILENCE_DB)
+    if not len(voiced):
+        return 0, len(samples)
+
+    start = max(0, voiced[0] * frame - int(LEAD_PAD * fps))
+    end = min(len(samples), (voiced[-1] + 1) * frame + int(TAIL_PAD * fps))
+    return start, end
+
+def normalize(samples, fps=SAMPLE_RATE):
+    """Returns (trimmed and gain-adjusted samples, stats) in a single pass over the data"""
+    start, end = speech_bounds(samples, fps)
+    speech = samples[start:end]
+
+    loudness = integrated_loudness(speech, fps)
+    gain_db = TARGET_LUFS - loudness
+    peak = float(np.max(np.abs(speech))) if len(speech) else 0.0
+    if peak > 0:
+        # Limit the gain so the loudest sample stays under the ceiling
+        gain_db = min(gain_db, PEAK_CEILING_DB - 20.0 * np.log10(peak))
+
+    out = speech * np.float32(10.0 ** (gain_db / 20.0))
+    stats = {
+        'loudness': loudness,
+        'gain_db': gain_db,
+        'trimmed': (start + len(samples) - end) / fps,
+        'duration': len(samples) / fps,
+    }
+    return out, stats
+
+def load_narration(audio_file, fps=SAMPLE_RATE):
+    """Decodes, normalises and trims a narration file.
+
+    Returns the samples and the duration of the file itself, untrimmed.
+    """
+    samples, stats = normalize(decode_audio(audio_file, fps), fps)
+    print(f"    Loudness {stats['loudness']:.1f} LUFS, gain {stats['gain_db']:+.1f} dB, "
+          f"trimmed {stats['trimmed']:.2f}s of silence")
+    return samples, stats['duration']
+
+def narration_clip(samples, duration=None, fps=SAMPLE_RATE):
+    """In-memory moviepy clip of the samples, padded with silence up to `duration`"""
+    from moviepy.audio.AudioClip import AudioArrayClip
+
+    if duration is not None:
+        missing = int(round(duration * fps)) - len(samples)
+        if missing > 0:
+            samples = np.concatenate([samples, np.zeros((missing, samples.shape[1]), samples.dtype)])
+    return AudioArrayClip(samples, fps=fps)
@@ -1,90 +1,258 @@
 import os
-import re
+import sys
+import json
+import math
+import hashlib
 from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
 from pptx.util import Inches, Pt
+from voiceover_script import parse_frames, narration_segments
+from assets import check_assets
+import tts_cache
+from overlays import png_stream
 
 TRANSCRIPT_FILE = 'voiceover-script.md'
 OUTPUT_PPT = 'input_output_tutorial.pptx'
+MANIFEST_FILE = 'input_output_tutorial.manifest.json'
+MANIFEST_VERSION = 1
+NARRATED_PPT = 'input_output_tutorial_narrated.pptx'
 
-def parse_transcript(file_path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+def file_signature(path):
+    """Cheap change detector: (size, mtime) of a file"""
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
 
-    segments = []
-    # Regex to split by frames
-    blocks = re.split(r'## (?:Frame|Segment)', content)
-    
-    for block in blocks[1:]: # Skip header
-        # Extract Image path
-        img_match = re.search(r'\*\*Image(?: to use)?:\*\*\s*`?([^`\n\r]+)`?', block)
-        
-        # Extract Transcript/Voiceover
-        transcript_match = re.search(r'\*\*(?:Voiceover|Transcript):\*\*\s*(?:")?([\s\S]+?)(?:")?(?:\n---|#|$)', block)
-        
-        if img_match:
-            img_path = img_match.group(1).strip()
-            
-            # Handle v2_final path correction
-            if not os.path.exists(img_path) and os.path.exists(os.path.join("v2_final", img_path)):
-                img_path = os.path.join("v2_final", img_path)
-            elif not os.path.exists(img_path) and "v2_final/" in img_path:
-                 # Check if we are already inside a related folder or need base path
-                 pass
-
-            # Clean text
-            text = ""
-            if transcript_match:
-                 raw_text = transcript_match.group(1).strip()
-                 if raw_text.startswith('"') and raw_text.endswith('"'):
-                    raw_text = raw_text[1:-1]
-                 text = raw_text
-            
-            segments.append({
-                'image': img_path,
-                'text': text
-            })
-            
-    return segments
-
-def create_ppt():
-    print("Creating PowerPoint presentation...")
-    segments = parse_transcript(TRANSCRIPT_FILE)
-    
-    if not segments:
-        print("No segments found!")
+def hash_bytes(data):
+    return hashlib.sha1(data).hexdigest()
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_FILE) or not os.path.exists(OUTPUT_PPT):
+        return None
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable manifest: {e}")
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+def save_manifest(frames):
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'frames': [{k: v for k, v in frame.items() if k not in ('text', 'highlights')} for frame in frames]
+    }
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+def build_frames(segments, manifest):
+    """Maps every script frame to a slide and hashes its content.
+
+    Image hashes are reused from the manifest when the file's size and mtime
+    are unchanged, so unchanged images are never read.
+    """
+    previous = {}
+    if manifest:
+        previous = {frame['image']: frame for frame in manifest['frames']}
+
+    frames = []
+    for i, seg in enumerate(segments):
+        # One picture per slide: the first image of a multi-image segment
+        img_path = seg['images'][0]
+        sig = file_signature(img_path)
+        old = previous.get(img_path)
+        if old and old['image_sig'] == sig:
+            image_hash = old['image_hash']
+        else:
+            with open(img_path, 'rb') as f:
+                image_hash = hash_bytes(f.read())
+
+        frames.append({
+            'frame': i,
+            'slide': len(frames),
+            'image': img_path,
+            'image_sig': sig,
+            'image_hash': image_hash,
+            'text_hash': hash_bytes(seg['text'].encode('utf-8')),
+            'highlight': seg['highlight'],
+            'text': seg['text'],
+            'highlights': seg['highlights']
+        })
+    return frames
+
+def picture_source(frame):
+    """The slide image, with its declared highlights composited in memory"""
+    if frame.get('highlights'):
+        return png_stream(frame['image'], frame['highlights'])
+    return frame['image']
+
+def add_frame_slide(prs, frame):
+    slide = prs.slides.add_slide(prs.slide_layouts[6]) # 6 is usually blank
+
+    # Add Image covering the whole slide
+    # left, top, width, height
+    slide.shapes.add_picture(picture_source(frame), 0, 0, width=prs.slide_width, height=prs.slide_height)
+
+    # Add Speaker Notes
+    if frame['text']:
+        slide.notes_slide.notes_text_frame.text = frame['text']
+    return slide
+
+def autoplay_timing(shape_id, duration_ms):
+    """p:timing that starts the media shape as soon as the slide is shown (PowerPoint's "Automatically")"""
+    return (
+        f'<p:timing {nsdecls("p")}><p:tnLst><p:par>'
+        '<p:cTn id="1" dur="indefinite" restart="never" nodeType="tmRoot"><p:childTnLst>'
+        '<p:seq concurrent="1" nextAc="seek"><p:cTn id="2" dur="indefinite" nodeType="mainSeq"><p:childTnLst>'
+        '<p:par><p:cTn id="3" fill="hold"><p:stCondLst><p:cond delay="indefinite"/>'
+        '<p:cond evt="onBegin" delay="0"><p:tn val="2"/></p:cond></p:stCondLst><p:childTnLst>'
+        '<p:par><p:cTn id="4" fill="hold"><p:stCondLst><p:cond delay="0"/></p:stCondLst><p:childTnLst>'
+        '<p:par><p:cTn id="5" presetID="1" presetClass="mediacall" presetSubtype="0" fill="hold" nodeType="afterEffect">'
+        '<p:stCondLst><p:cond delay="0"/></p:stCondLst><p:childTnLst>'
+        '<p:cmd type="call" cmd="playFrom(0.0)"><p:cBhvr>'
+        f'<p:cTn id="6" dur="{duration_ms}" fill="hold"/><p:tgtEl><p:spTgt spid="{shape_id}"/></p:tgtEl>'
+        '</p:cBhvr></p:cmd>'
+        '</p:childTnLst></p:cTn></p:par></p:childTnLst></p:cTn></p:par></p:childTnLst></p:cTn></p:par>'
+        '</p:childTnLst></p:cTn>'
+        '<p:prevCondLst><p:cond evt="onPrev" delay="0"><p:tgtEl><p:sldTgt/></p:tgtEl></p:cond></p:prevCondLst>'
+        '<p:nextCondLst><p:cond evt="onNext" delay="0"><p:tgtEl><p:sldTgt/></p:tgtEl></p:cond></p:nextCondLst>'
+        '</p:seq>'
+        '<p:video><p:cMediaNode vol="80000"><p:cTn id="7" fill="hold" display="0">'
+        '<p:stCondLst><p:cond delay="indefinite"/></p:stCondLst></p:cTn>'
+        f'<p:tgtEl><p:spTgt spid="{shape_id}"/></p:tgtEl></p:cMediaNode></p:video>'
+        '</p:childTnLst></p:cTn></p:par></p:tnLst></p:timing>'
+    )
+
+def add_narration(prs, slide, audio_file, duration):
+    """Embeds the narration, plays it when the slide starts and advances the slide when it ends"""
+    icon = Inches(0.4)
+    # Just off the right edge: part of the slide, never visible in the show
+    media = slide.shapes.add_movie(audio_file, prs.slide_width + icon, 0, icon, icon, mime_type='audio/mpeg')
+    duration_ms = int(math.ceil(duration * 1000))
+
+    sld = slide._element
+    # add_movie adds a click-to-play timing; replace it with autoplay
+    for old in sld.findall(qn('p:timing')) + sld.findall(qn('p:transition')):
+        sld.remove(old)
+    transition = parse_xml(f'<p:transition {nsdecls("p")} advClick="1" advTm="{duration_ms}"/>')
+    # p:sld children are ordered: cSld, clrMapOvr, transition, timing, extLst
+    anchor = sld.find(qn('p:clrMapOvr'))
+    (anchor if anchor is not None else sld.find(qn('p:cSld'))).addnext(transition)
+    transition.addnext(parse_xml(autoplay_timing(media.shape_id, duration_ms)))
+
+def replace_picture(prs, slide, frame):
+    """Swaps the full-slide picture, dropping the old image part from the package"""
+    for shape in list(slide.shapes):
+        if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+            rId = shape._element.blip_rId
+            shape._element.getparent().remove(shape._element)
+            slide.part.drop_rel(rId)
+    slide.shapes.add_picture(picture_source(frame), 0, 0, width=prs.slide_width, height=prs.slide_height)
+
+def picture_changed(new, old):
+    return new['image_hash'] != old['image_hash'] or new['highlight'] != old.get('highlight')
+
+def patch_ppt(frames, manifest):
+    """Updates only the slides whose image, highlights or notes changed in the existing deck"""
+    changed = [
+        (new, old) for new, old in zip(frames, manifest['frames'])
+        if picture_changed(new, old) or new['text_hash'] != old['text_hash']
+    ]
+    if not changed:
+        print(f"{OUTPUT_PPT} is up to date.")
         return
 
+    prs = Presentation(OUTPUT_PPT)
+    for new, old in changed:
+        slide = prs.slides[new['slide']]
+        print(f"Updating Slide {new['slide']+1}: {new['image']}")
+
+        if picture_changed(new, old):
+            replace_picture(prs, slide, new)
+        if new['text_hash'] != old['text_hash']:
+            slide.notes_slide.notes_text_frame.text = new['text']
+
+    prs.save(OUTPUT_PPT)
+    print(f"Patched {len(changed)} slide(s) in {OUTPUT_PPT}")
+
+def new_presentation():
     # 16:9 Defaults
     prs = Presentation()
     prs.slide_width = Inches(13.333)
     prs.slide_height = Inches(7.5)
-    
-    blank_slide_layout = prs.slide_layouts[6] # 6 is usually blank
+    return prs
+
+def create_narrated_ppt(transcript_file):
+    """Self-running deck: one slide per video segment with its narration embedded.
+
+    Uses the segments the video build narrates and the audio it synthesized
+    into tts_cache, so nothing is synthesized or decoded here. Each slide
+    advances when its audio file ends.
+    """
+    print("Creating narrated PowerPoint presentation...")
+    segments = narration_segments(transcript_file)
+    if not segments:
+        print("No segments found!")
+        return
+    if not check_assets(segments):
+        return
 
+    index = tts_cache.load_index()
+    prs = new_presentation()
+    silent = 0
     for i, seg in enumerate(segments):
-        img_path = seg['image']
-        text = seg['text']
-        
-        if not os.path.exists(img_path):
-            print(f"Warning: Image not found {img_path}, skipping.")
+        print(f"Adding Slide {i+1}: {seg['images'][0]}")
+        slide = add_frame_slide(prs, {'image': seg['images'][0], 'text': seg['text'],
+                                      'highlights': seg['highlights']})
+        narration = tts_cache.find_narration(seg['text'], index)
+        if narration is None:
+            print(f"  Warning: no narration for slide {i+1}; render the video first.")
+            silent += 1
             continue
-            
-        print(f"Adding Slide {i+1}: {img_path}")
-        
-        slide = prs.slides.add_slide(blank_slide_layout)
-        
-        # Add Image covering the whole slide
-        # left, top, width, height
-        slide.shapes.add_picture(img_path, 0, 0, width=prs.slide_width, height=prs.slide_height)
-        
-        # Add Speaker Notes
-        if text:
-            notes_slide = slide.notes_slide
-            text_frame = notes_slide.notes_text_frame
-            text_frame.text = text
+        audio_file, duration, voice = narration
+        if voice != tts_cache.VOICE:
+            print(f"  Note: slide {i+1} uses the fallback voice {voice}.")
+        add_narration(prs, slide, audio_file, duration)
+
+    prs.save(NARRATED_PPT)
+    print(f"Successfully saved narrated presentation to {NARRATED_PPT}"
+          + (f" ({silent} slide(s) without audio)" if silent else ""))
+
+def create_ppt(incremental=True, transcript_file=None, narrated=False):
+    if narrated:
+        create_narrated_ppt(transcript_file or TRANSCRIPT_FILE)
+        return
+
+    print("Creating PowerPoint presentation...")
+    segments = parse_frames(transcript_file or TRANSCRIPT_FILE)
+    
+    if not segments:
+        print("No segments found!")
+        return
+
+    if not check_assets(segments):
+        return
+
+    manifest = load_manifest() if incremental else None
+    frames = build_frames(segments, manifest)
+
+    # Patching is only possible while the frame -> slide mapping is unchanged
+    if manifest and [f['frame'] for f in frames] == [f['frame'] for f in manifest['frames']]:
+        patch_ppt(frames, manifest)
+        save_manifest(frames)
+        return
+
+    prs = new_presentation()
+    for frame in frames:
+        print(f"Adding Slide {frame['slide']+1}: {frame['image']}")
+        add_frame_slide(prs, frame)
 
     prs.save(OUTPUT_PPT)
+    save_manifest(frames)
     print(f"Successfully saved presentation to {OUTPUT_PPT}")
 
 if __name__ == "__main__":
-    create_ppt()
+    create_ppt(incremental='--full' not in sys.argv, narrated='--narrated' in sys.argv)
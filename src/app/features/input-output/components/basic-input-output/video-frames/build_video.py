@@ -1,6 +1,11 @@
 import os
 import re
+import sys
+import math
+import queue
 import asyncio
+import threading
+import subprocess
 import edge_tts
 import PIL.Image
 
@@ -11,69 +16,47 @@ if not hasattr(PIL.Image, 'ANTIALIAS'):
 from moviepy.editor import *
 import random
 import time
+from captions import segment_cues, write_captions, mux_subtitles, ffmpeg_binary
+from audio_stage import SAMPLE_RATE, load_narration, narration_clip
+from voiceover_script import SCRIPT_FILE, narration_segments
+from assets import check_assets
+from ladder import write_ladder
+from overlays import composite
+from thumbnails import ThumbnailTrack, canvas_size
+import tts_cache
+from tts_cache import VOICE, FALLBACK_VOICES
 
-# VOICE CONFIGURATION
-VOICE = "en-US-ChristopherNeural"  
-
-def clean_text(text):
-    """Removes markdown formatting vs code quotes etc"""
-    text = text.replace('`', '').replace('*', '')
-    text = text.replace('<', ' ').replace('>', ' ')
-    text = text.replace('[', ' ').replace(']', ' ')
-    text = text.replace('(', ' ').replace(')', ' ')
-    text = text.replace('"', '').replace("'", "")
-    text = text.replace('\n', ' ')
-    return text.strip()
-
-def parse_transcript(file_path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    segments = []
-    # Regex to find segments
-    seg_blocks = content.split('## Segment')
-    for block in seg_blocks[1:]: # Skip preamble
-        try:
-            image_match = re.search(r'\*\*Image to use:\*\*\s*`?([^`\n\r]+)`?', block)
-            transcript_match = re.search(r'\*\*Transcript:\*\*\s*"([^"]+)"', block, re.DOTALL)
-            effect_match = re.search(r'\*\*Effect:\*\*\s*([^\n\r]+)', block)
-            
-            if not transcript_match:
-                 transcript_match = re.search(r'\*\*Transcript:\*\*\s*([\s\S]+?)(?:---|$)', block)
-
-            if image_match and transcript_match:
-                img_name = image_match.group(1).strip()
-                transcript_text = clean_text(transcript_match.group(1))
-                effect = effect_match.group(1).strip() if effect_match else None
-                
-                # Legacy check removed to support multi-image strings
-                # if not os.path.exists(img_name):
-                #    print(f"WARNING: Image not found: {img_name}")
-                #    continue
-
-                segments.append({
-                    'image': img_name,
-                    'text': transcript_text,
-                    'effect': effect
-                })
-        except Exception as e:
-            print(f"Error parsing block: {e}")
-            continue
-            
-    return segments
+# Pause after each segment's speech (the narration itself is trimmed of silence)
+SEGMENT_PAUSE = 0.35
 
-async def generate_audio_edge(text, output_file):
-    """Generates audio using Edge TTS with Retry Logic and Voice Fallback"""
-    voices = [VOICE, "en-US-AriaNeural", "en-US-GuyNeural"]
-    
-    for voice in voices:
+FPS = 24
+# The narration is encoded once, over the joined timeline
+AUDIO_BITRATE = '192k'
+DURATION_RE = re.compile(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)')
+# Segments allowed to wait between two pipeline stages
+QUEUE_DEPTH = 2
+
+async def generate_audio_edge(text):
+    """Generates audio using Edge TTS with Retry Logic and Voice Fallback.
+
+    Returns (audio file, voice) or None. Each voice's audio is cached under
+    its own key, so the primary voice is tried again on the next run while
+    a fallback voice's earlier audio is reused instead of re-synthesized.
+    """
+    for voice in (VOICE,) + FALLBACK_VOICES:
+        output_file = tts_cache.audio_path(text, voice)
+        if voice != VOICE and os.path.exists(output_file):
+            print(f"    Using cached audio of fallback voice {voice}")
+            return output_file, voice
         max_retries = 3
         for attempt in range(max_retries):
             try:
                 print(f"    Attempting with voice: {voice} (Try {attempt+1})")
                 communicate = edge_tts.Communicate(text, voice)
-                await communicate.save(output_file)
-                return True
+                # Never leave a truncated file in the cache
+                await communicate.save(output_file + '.part')
+                os.replace(output_file + '.part', output_file)
+                return output_file, voice
             except Exception as e:
                 print(f"    Error: {e}")
                 await asyncio.sleep(2 + attempt) # Backoff
@@ -81,77 +64,203 @@ async def generate_audio_edge(text, output_file):
         print(f"    Voice {voice} failed completely. Trying next voice...")
     
     print("  [ERROR] All voices failed.")
-    return False
+    return None
 
 # ... zoom effect function remains same ...
 
-async def create_video_async(segments, output_file='input_output_tutorial.mp4'):
-    clips = []
-    
-    print(f"Found {len(segments)} segments.")
-    
-    for i, seg in enumerate(segments):
-        print(f"Processing segment {i+1}: {seg['image']}")
-        
-        # 1. Generate Audio (Async)
-        audio_file = f"temp_vo_{i}.mp3"
-        success = await generate_audio_edge(seg['text'], audio_file)
-        
-        if not success:
-            print("Skipping segment due to audio failure.")
-            continue
-            
-        await asyncio.sleep(1)
-        
-        # 2. Create Clip(s)
+def run_stage(work, inbox, outbox=None):
+    """Pipeline stage: applies `work` to each item until the None sentinel.
+
+    A failing item is reported and dropped, so one bad segment never stalls
+    the stages upstream that are blocked on a full queue.
+    """
+    while True:
+        item = inbox.get()
+        if item is None:
+            break
         try:
-            audio_clip = AudioFileClip(audio_file)
-            total_duration = audio_clip.duration + 0.5
-            
-            # Handle multiple images (e.g. "img1.png, img2.png")
-            images = [img.strip() for img in seg['image'].split(',')]
-            num_images = len(images)
-            duration_per_image = total_duration / num_images
-            
-            segment_clips = []
-            for img_path in images:
-                if not os.path.exists(img_path):
-                    print(f"  WARNING: Image {img_path} not found. Using Placeholder.")
-                    # Fallback or error? For now, skip
-                    continue
-                    
-                img_clip = ImageClip(img_path).set_duration(duration_per_image)
-                img_clip = img_clip.crossfadein(0.2)
-                segment_clips.append(img_clip)
-            
-            if segment_clips:
-                # Concatenate images for this segment
-                final_seg_clip = concatenate_videoclips(segment_clips, method="compose")
-                final_seg_clip = final_seg_clip.set_audio(audio_clip)
-                clips.append(final_seg_clip)
-                
+            result = work(*item)
         except Exception as e:
-            print(f"Error creating clip for segment {i}: {e}")
-        
-    if clips:
-        print("Concatenating video clips...")
-        # Method="compose" is crucial for handling variable sized frames from zoom
-        final_video = concatenate_videoclips(clips, method="compose")
-        final_video.write_videofile(output_file, fps=24, threads=1)
-        
-        # Cleanup
-        for i in range(len(segments)):
-            try:
-                os.remove(f"temp_vo_{i}.mp3")
-            except:
-                pass
-        print(f"SUCCESS: Video generated at {output_file}")
+            print(f"Error in {work.__name__} stage for segment {item[0]}: {e}")
+            continue
+        if outbox is not None and result is not None:
+            outbox.put(result)
+    if outbox is not None:
+        outbox.put(None)
+
+def build_segment(i, seg, audio_file, canvas):
+    """Builds one segment's clip: normalised narration over its image(s)"""
+    samples, file_duration = load_narration(audio_file)
+    speech = len(samples) / SAMPLE_RATE
+    # Whole frames, so the audio and video of every segment end together
+    total_duration = math.ceil((speech + SEGMENT_PAUSE) * FPS) / FPS
+    audio_clip = narration_clip(samples, total_duration)
+
+    # Handle multiple images (e.g. "img1.png, img2.png"), resolved by the preflight
+    images = seg['images']
+    duration_per_image = total_duration / len(images)
+
+    segment_clips = []
+    for img_path in images:
+        # Decoded once into overlays' cache (the thumbnail stage reuses it), with any
+        # declared highlights composited on; no highlighted copy is read
+        img_clip = ImageClip(composite(img_path, seg['highlights'])).set_duration(duration_per_image)
+        img_clip = img_clip.crossfadein(0.2)
+        segment_clips.append(img_clip)
+
+    # Concatenate images for this segment, centred on the shared canvas
+    seg_clip = concatenate_videoclips(segment_clips, method="compose")
+    seg_clip = CompositeVideoClip([seg_clip.set_position('center')], size=canvas)
+    seg_clip = seg_clip.set_duration(total_duration).set_audio(audio_clip)
+    return i, seg, seg_clip, speech, file_duration
+
+def encode_segment(i, seg_clip):
+    # PCM audio: AAC would add priming and padding at every join, drifting the audio
+    seg_file = f"temp_seg_{i}.mkv"
+    seg_clip.write_videofile(seg_file, fps=FPS, codec='libx264', audio_codec='pcm_s16le',
+                             temp_audiofile=f"temp_seg_{i}_audio.wav", threads=1, logger=None)
+    seg_clip.close()
+    return seg_file
+
+def media_duration(path):
+    """Container duration in seconds from ffmpeg's header dump, or None"""
+    result = subprocess.run([ffmpeg_binary(), '-i', path], capture_output=True, text=True)
+    match = DURATION_RE.search(result.stderr)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+def concat_segments(segment_files, output_file, expected_duration=None):
+    """Joins the encoded segments (ffmpeg concat demuxer).
+
+    The video is stream-copied; the segments' PCM audio is encoded to AAC
+    once over the whole timeline. With expected_duration (the sum of the
+    segment durations, which captions, thumbnails and the ladder are timed
+    by), a joined video that differs by more than a frame is reported.
+    """
+    list_file = os.path.splitext(output_file)[0] + '.segments.txt'
+    with open(list_file, 'w', encoding='utf-8') as f:
+        for seg_file in segment_files:
+            # The demuxer resolves relative names against the list's folder, not the cwd
+            path = os.path.abspath(seg_file).replace("'", "'\\''")
+            f.write(f"file '{path}'\n")
+    cmd = [
+        ffmpeg_binary(), '-y', '-loglevel', 'error',
+        '-f', 'concat', '-safe', '0', '-i', list_file,
+        '-c:v', 'copy', '-c:a', 'aac', '-b:a', AUDIO_BITRATE, '-movflags', '+faststart',
+        output_file
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    os.remove(list_file)
+    if result.returncode != 0:
+        print(f"  ERROR: Could not join segments: {result.stderr.strip()}")
+        return False
+    if expected_duration is not None:
+        duration = media_duration(output_file)
+        if duration is not None and abs(duration - expected_duration) > 1 / FPS:
+            print(f"  WARNING: Joined video is {duration:.3f}s, segments add up to {expected_duration:.3f}s; "
+                  f"captions and thumbnails may drift.")
+    return True
+
+async def create_video_async(segments, output_file='input_output_tutorial.mp4', mux_captions=False,
+                             ladder_dir=None, dash=False, thumbnail_format='jpg'):
+    """Renders the video as a pipeline: synthesize -> build segment -> encode segment -> mux.
+
+    Synthesis runs on the event loop while a build thread and an encode thread
+    work on earlier segments. The queues between them are bounded, so a slow
+    stage holds the faster ones back instead of piling up clips in memory.
+    With ladder_dir, the joined video is also turned into an HLS (or DASH)
+    rendition ladder whose segments start on the script segment boundaries.
+    Scrub-preview sprite sheets and their VTT track are written next to the video.
+    """
+    print(f"Found {len(segments)} segments.")
+    # Every image is resolved before the first TTS request
+    if not check_assets(segments):
+        return
+    canvas = canvas_size(segments)
+    thumbnails = ThumbnailTrack(canvas, thumbnail_format)
+
+    os.makedirs(tts_cache.CACHE_DIR, exist_ok=True)
+    narration_index = tts_cache.load_index()
+
+    synthesized = queue.Queue(QUEUE_DEPTH)
+    built = queue.Queue(QUEUE_DEPTH)
+    segment_files = []
+    cues = []
+    boundaries = []
+    timeline = 0.0  # Start time of the next segment in the final video
+
+    def build(i, seg, audio_file, voice):
+        print(f"Building segment {i+1}: {seg['image']}")
+        i, seg, seg_clip, speech, file_duration = build_segment(i, seg, audio_file, canvas)
+        seg['thumbnails'] = thumbnails.add_frames(seg)
+        # The slide deck embeds the cached file as is, so it needs the file's own length
+        narration_index[tts_cache.cache_key(seg['text'], voice)] = {'audio_duration': file_duration}
+        return i, seg, seg_clip, speech
+
+    def encode(i, seg, seg_clip, speech):
+        nonlocal timeline
+        duration = seg_clip.duration
+        segment_files.append(encode_segment(i, seg_clip))
+        # Captions come for free: the text and its exact duration are known here
+        cues.extend(segment_cues(seg['text'], timeline, speech))
+        boundaries.append(timeline)
+        thumbnails.add_cues(seg['thumbnails'], timeline, duration)
+        timeline += duration
+        print(f"Encoded segment {i+1} ({duration:.2f}s)")
+
+    stages = [
+        threading.Thread(target=run_stage, args=(build, synthesized, built), daemon=True),
+        threading.Thread(target=run_stage, args=(encode, built), daemon=True),
+    ]
+    for stage in stages:
+        stage.start()
+
+    try:
+        for i, seg in enumerate(segments):
+            audio_file, voice = tts_cache.audio_path(seg['text']), VOICE
+            if os.path.exists(audio_file):
+                print(f"Cached narration for segment {i+1}: {seg['image']}")
+            else:
+                print(f"Synthesizing segment {i+1}: {seg['image']}")
+                result = await generate_audio_edge(seg['text'])
+
+                if not result:
+                    print("Skipping segment due to audio failure.")
+                    continue
+                audio_file, voice = result
+                await asyncio.sleep(1)
+
+            # Waits, off the event loop, while the build stage is behind
+            await asyncio.to_thread(synthesized.put, (i, seg, audio_file, voice))
+    finally:
+        await asyncio.to_thread(synthesized.put, None)
+        for stage in stages:
+            await asyncio.to_thread(stage.join)
+        tts_cache.save_index(narration_index)
+
+    if segment_files:
+        print("Joining encoded segments...")
+        if concat_segments(segment_files, output_file, timeline):
+            vtt_file, srt_file = write_captions(cues, output_file)
+            print(f"Captions written: {vtt_file}, {srt_file}")
+            if mux_captions and mux_subtitles(output_file, srt_file):
+                print("Captions muxed as a soft subtitle stream.")
+            thumbnails.write(output_file)
+            if ladder_dir:
+                write_ladder(output_file, canvas[1], boundaries, timeline, ladder_dir, dash)
+            print(f"SUCCESS: Video generated at {output_file}")
+
+        # Cleanup (the narration stays in tts_cache for the next build and the slide deck)
+        for seg_file in segment_files:
+            os.remove(seg_file)
     else:
         print("No clips generated.")
 
 if __name__ == "__main__":
-    segments = parse_transcript('voiceover-script.md')
+    segments = narration_segments(SCRIPT_FILE)
     if segments:
-        asyncio.run(create_video_async(segments))
+        asyncio.run(create_video_async(segments, mux_captions='--mux-captions' in sys.argv))
     else:
         print("No segments found in transcript!")
@@ -1,7 +1,10 @@
 import os
-import re
 from moviepy.editor import *
 import PIL.Image
+from voiceover_script import parse_transcript_timings
+from assets import check_assets
+from overlays import composite
+from thumbnails import ThumbnailTrack, canvas_size
 
 # COMPATIBILITY PATCH: Fix for Pillow 10+ where ANTIALIAS is removed
 if not hasattr(PIL.Image, 'ANTIALIAS'):
@@ -11,67 +14,18 @@ TRANSCRIPT_FILE = 'voiceover-script.md'
 AUDIO_SOURCE_FILE = 'input_output_tutorial_camp.mp4'
 OUTPUT_FILE = 'input_output_tutorial_final.mp4'
 
-def time_to_seconds(time_str):
-    """Converts 'M:SS' or 'H:MM:SS' string to seconds (float)."""
-    try:
-        parts = time_str.strip().split(':')
-        if len(parts) == 2:
-            return int(parts[0]) * 60 + int(parts[1])
-        elif len(parts) == 3:
-            return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-    except ValueError:
-        pass
-    return 0.0
-
-def parse_transcript_timings(file_path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    segments = []
-    # Regex to split by frames
-    blocks = re.split(r'## (?:Frame|Segment)', content)
-    
-    for block in blocks[1:]: # Skip header
-        # Extract Image path
-        img_match = re.search(r'\*\*Image(?: to use)?:\*\*\s*`?([^`\n\r]+)`?', block)
-        
-        # Extract Timing: e.g. "0:00 – 0:07"
-        # Note: The separator might be a hyphen -, en-dash –, or em-dash —
-        timing_match = re.search(r'\*\*Timing:\*\*\s*(\d+:\d+)\s*[–-—]\s*(\d+:\d+)', block)
-        
-        if img_match and timing_match:
-            img_path = img_match.group(1).strip()
-            start_str = timing_match.group(1)
-            end_str = timing_match.group(2)
-            
-            start_sec = time_to_seconds(start_str)
-            end_sec = time_to_seconds(end_str)
-            
-            # Handle v2_final path correction if needed
-            if not os.path.exists(img_path) and os.path.exists(os.path.join("v2_final", img_path)):
-                img_path = os.path.join("v2_final", img_path)
-            elif not os.path.exists(img_path) and "v2_final/" in img_path:
-                 # Check if we are already inside a related folder or need base path
-                 pass
-
-            segments.append({
-                'image': img_path,
-                'start': start_sec,
-                'end': end_sec,
-                'duration': end_sec - start_sec
-            })
-            
-    return segments
-
-def build_video():
-    print(f"Reading transcript: {TRANSCRIPT_FILE}")
-    segments = parse_transcript_timings(TRANSCRIPT_FILE)
+def build_video(transcript_file=None, thumbnail_format='jpg'):
+    transcript_file = transcript_file or TRANSCRIPT_FILE
+    print(f"Reading transcript: {transcript_file}")
+    segments = parse_transcript_timings(transcript_file)
     
     if not segments:
         print("No segments found in transcript!")
         return
 
     print(f"Found {len(segments)} segments with timings.")
+    if not check_assets(segments):
+        return
     
     # 1. Load Audio
     if not os.path.exists(AUDIO_SOURCE_FILE):
@@ -83,19 +37,18 @@ def build_video():
     main_audio = source_video.audio
     
     clips = []
+    thumbnails = ThumbnailTrack(canvas_size(segments), thumbnail_format)
     
     for i, seg in enumerate(segments):
-        img_path = seg['image']
+        img_path = seg['images'][0]
         duration = seg['duration']
         
-        if not os.path.exists(img_path):
-            print(f"Warning: Image not found {img_path}, skipping segment.")
-            continue
-            
         print(f"Segment {i+1}: {img_path} ({seg['start']}s -> {seg['end']}s, dur={duration}s)")
         
         # Create Image Clip
-        img_clip = ImageClip(img_path).set_duration(duration)
+        img_clip = ImageClip(composite(img_path, seg['highlights'])).set_duration(duration)
+        # Previews from the frame just decoded, on the script's own timings
+        thumbnails.add_cues(thumbnails.add_frames(seg, [img_path]), seg['start'], duration)
         img_clip = img_clip.set_start(seg['start'])
         img_clip = img_clip.crossfadein(0.2) # Smooth entry
         
@@ -128,6 +81,7 @@ def build_video():
         
         print(f"Writing to {OUTPUT_FILE}...")
         final_video.write_videofile(OUTPUT_FILE, fps=24, threads=4, audio_codec='aac')
+        thumbnails.write(OUTPUT_FILE)
         print("Done!")
     else:
         print("No clips created.")
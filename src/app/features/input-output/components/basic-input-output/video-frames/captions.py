@@ -0,0 +1,90 @@
+import re
+import os
+import subprocess
+
+# Keep cues readable: at most two lines of ~42 characters
+MAX_CUE_CHARS = 84
+
+def split_sentences(text):
+    """Splits voiceover text into sentences, breaking long ones at commas"""
+    sentences = [s.strip() for s in re.split(r'(?<=[.!?])\s+', text) if s.strip()]
+
+    cues = []
+    for sentence in sentences:
+        while len(sentence) > MAX_CUE_CHARS:
+            cut = sentence.rfind(', ', 0, MAX_CUE_CHARS)
+            if cut == -1:
+                cut = sentence.rfind(' ', 0, MAX_CUE_CHARS)
+            if cut == -1:
+                break
+            cues.append(sentence[:cut + 1].strip())
+            sentence = sentence[cut + 1:].strip()
+        cues.append(sentence)
+    return cues
+
+def segment_cues(text, start, duration):
+    """Spreads a segment's sentences over its audio, proportional to their length"""
+    parts = split_sentences(text)
+    total_chars = sum(len(p) for p in parts) or 1
+
+    cues = []
+    t = start
+    for part in parts:
+        length = duration * len(part) / total_chars
+        cues.append((t, t + length, part))
+        t += length
+    return cues
+
+def format_timestamp(seconds, separator):
+    ms = int(round(seconds * 1000))
+    h, ms = divmod(ms, 3600000)
+    m, ms = divmod(ms, 60000)
+    s, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d}{separator}{ms:03d}"
+
+def write_webvtt(cues, output_file):
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write("WEBVTT\n\n")
+        for start, end, text in cues:
+            f.write(f"{format_timestamp(start, '.')} --> {format_timestamp(end, '.')}\n{text}\n\n")
+
+def write_srt(cues, output_file):
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for i, (start, end, text) in enumerate(cues, 1):
+            f.write(f"{i}\n{format_timestamp(start, ',')} --> {format_timestamp(end, ',')}\n{text}\n\n")
+
+def write_captions(cues, video_file):
+    """Writes <video>.vtt and <video>.srt next to the video, returns their paths"""
+    base = os.path.splitext(video_file)[0]
+    vtt_file, srt_file = base + '.vtt', base + '.srt'
+    write_webvtt(cues, vtt_file)
+    write_srt(cues, srt_file)
+    return vtt_file, srt_file
+
+def ffmpeg_binary():
+    # Same binary moviepy renders with, if available
+    try:
+        from moviepy.config import get_setting
+        return get_setting("FFMPEG_BINARY")
+    except ImportError:
+        return "ffmpeg"
+
+def mux_subtitles(video_file, srt_file, language="eng"):
+    """Adds the captions as a soft subtitle stream; audio and video are stream-copied"""
+    tmp_file = os.path.splitext(video_file)[0] + '.subs.tmp.mp4'
+    cmd = [
+        ffmpeg_binary(), '-y', '-loglevel', 'error',
+        '-i', video_file, '-i', srt_file,
+        '-map', '0', '-map', '1',
+        '-c', 'copy', '-c:s', 'mov_text',
+        '-metadata:s:s:0', f'language={language}',
+        tmp_file
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"  WARNING: Could not mux subtitles: {result.stderr.strip()}")
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        return False
+    os.replace(tmp_file, video_file)
+    return True
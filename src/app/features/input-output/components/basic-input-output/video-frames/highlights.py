@@ -0,0 +1,82 @@
+"""
+Highlight declarations in the voiceover script.
+
+A frame or segment may carry a line, next to its image line and before the
+voiceover, such as
+
+    **Highlight:** 96,250 560x70; 96,340 560x40 dim
+    **Highlight:** mask:masks/04_input.png tint #ffd400
+
+Regions are separated by ';'. Each one is either a rectangle "x,y WxH" in the
+image's own pixels or "mask:<image>" (white = highlighted, resized to the
+frame), optionally followed by a style and a "#rrggbb" colour:
+
+    outline  a coloured band around the region (default)
+    dim      darkens everything outside the region (outside all dim regions
+             of the line together)
+    tint     washes the region with the colour
+
+The builders composite the regions onto the plain image (overlays.py), so no
+separately exported "highlighted" copy of a slide is needed. Standard library
+only, like voiceover_script.
+"""
+
+import re
+
+STYLES = ('outline', 'dim', 'tint')
+DEFAULT_STYLE = 'outline'
+# The highlighter green of the exported highlighted/ slides
+DEFAULT_COLOR = (212, 255, 0)
+
+RECT_RE = re.compile(r'^(\d+),(\d+)$')
+SIZE_RE = re.compile(r'^(\d+)x(\d+)$', re.IGNORECASE)
+COLOR_RE = re.compile(r'^#([0-9a-f]{6})$', re.IGNORECASE)
+
+def parse_highlights(spec):
+    """Regions of a **Highlight:** line: [{'rect', 'mask', 'style', 'color'}].
+
+    Raises ValueError naming the part that could not be read.
+    """
+    regions = []
+    for part in (spec or '').split(';'):
+        words = part.replace(', ', ',').split()
+        if not words:
+            continue
+        region = {'rect': None, 'mask': None, 'style': DEFAULT_STYLE, 'color': DEFAULT_COLOR}
+
+        if words[0].lower().startswith('mask:'):
+            region['mask'] = words.pop(0)[len('mask:'):]
+            if not region['mask']:
+                raise ValueError(f"'{part.strip()}': mask: needs an image name")
+        else:
+            origin = RECT_RE.match(words[0])
+            size = SIZE_RE.match(words[1]) if len(words) > 1 else None
+            if not origin or not size:
+                raise ValueError(f"'{part.strip()}': expected 'x,y WxH' or 'mask:<image>'")
+            x, y = int(origin.group(1)), int(origin.group(2))
+            w, h = int(size.group(1)), int(size.group(2))
+            if not w or not h:
+                raise ValueError(f"'{part.strip()}': empty rectangle")
+            region['rect'] = (x, y, w, h)
+            del words[:2]
+
+        for word in words:
+            color = COLOR_RE.match(word)
+            if color:
+                value = color.group(1)
+                region['color'] = tuple(int(value[k:k + 2], 16) for k in (0, 2, 4))
+            elif word.lower() in STYLES:
+                region['style'] = word.lower()
+            else:
+                raise ValueError(f"'{part.strip()}': unknown style '{word}' (use {', '.join(STYLES)})")
+        regions.append(region)
+    return regions
+
+def check_regions(regions, size):
+    """Raises ValueError for a rectangle that does not fit in an image of `size` (width, height)"""
+    width, height = size
+    for region in regions:
+        if region['rect']:
+            x, y, w, h = region['rect']
+            if x + w > width or y + h > height:
+                raise ValueError(f"'{x},{y} {w}x{h}' does not fit the {width}x{height} image")
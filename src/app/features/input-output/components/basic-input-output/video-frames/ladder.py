@@ -0,0 +1,84 @@
+"""
+Adaptive-streaming output: an HLS (and optionally DASH) rendition ladder.
+
+The rendered video is decoded once; ffmpeg's split filter hands the same
+decoded frames to one encoder per rendition. Keyframes are forced at every
+script segment boundary (and at most MAX_SEGMENT seconds apart), with scene
+cut detection off, so streaming segments line up with the slides and a
+static slide costs one keyframe per segment.
+"""
+
+import os
+import math
+import subprocess
+from captions import ffmpeg_binary
+
+# (height, video bitrate, audio bitrate), best first
+RENDITIONS = [
+    (1080, '5000k', '192k'),
+    (720, '2800k', '128k'),
+    (480, '1400k', '96k'),
+]
+MAX_SEGMENT = 6.0
+MASTER_PLAYLIST = 'master.m3u8'
+DASH_MANIFEST = 'manifest.mpd'
+
+def keyframe_times(boundaries, duration):
+    """Segment starts, plus extra cuts so no streaming segment exceeds MAX_SEGMENT"""
+    starts = sorted(set(boundaries) | {0.0})
+    times = []
+    for start, end in zip(starts, starts[1:] + [duration]):
+        # Split long segments evenly rather than leaving a short tail
+        parts = max(1, math.ceil((end - start) / MAX_SEGMENT))
+        times += [round(start + k * (end - start) / parts, 3) for k in range(parts)]
+    return times
+
+def ladder_for(source_height):
+    """Renditions no taller than the source; the source height itself if it is smaller than all"""
+    ladder = [r for r in RENDITIONS if r[0] <= source_height]
+    return ladder or [(source_height - source_height % 2,) + RENDITIONS[-1][1:]]
+
+def write_ladder(source_file, source_height, boundaries, duration, out_dir, dash=False):
+    """Encodes every rendition from a single decode of source_file into out_dir.
+
+    With dash=True the segments are written once as fMP4 and described by both
+    a DASH manifest and an HLS master playlist.
+    """
+    ladder = ladder_for(source_height)
+    os.makedirs(out_dir, exist_ok=True)
+
+    outputs = ''.join(f'[v{i}]' for i in range(len(ladder)))
+    filters = [f"[0:v]split={len(ladder)}{outputs}"]
+    filters += [f"[v{i}]scale=-2:{height}[v{i}o]" for i, (height, _, _) in enumerate(ladder)]
+
+    cmd = [ffmpeg_binary(), '-y', '-loglevel', 'error', '-i', source_file,
+           '-filter_complex', ';'.join(filters)]
+    keyframes = ','.join(str(t) for t in keyframe_times(boundaries, duration))
+    for i, (height, video_rate, audio_rate) in enumerate(ladder):
+        # Per-stream options: without the :v:i specifier only the first encoder gets them
+        cmd += ['-map', f'[v{i}o]', '-map', '0:a',
+                f'-b:v:{i}', video_rate, f'-maxrate:v:{i}', video_rate, f'-bufsize:v:{i}', video_rate,
+                f'-force_key_frames:v:{i}', keyframes, f'-b:a:{i}', audio_rate]
+    cmd += ['-c:v', 'libx264', '-preset', 'medium', '-pix_fmt', 'yuv420p',
+            '-g', '100000', '-sc_threshold', '0',
+            '-c:a', 'aac', '-ar', '48000']
+
+    if dash:
+        cmd += ['-f', 'dash', '-seg_duration', '1', '-use_template', '1', '-use_timeline', '1',
+                '-adaptation_sets', 'id=0,streams=v id=1,streams=a',
+                '-hls_playlist', '1', '-hls_master_name', MASTER_PLAYLIST,
+                os.path.join(out_dir, DASH_MANIFEST)]
+    else:
+        var_map = ' '.join(f'v:{i},a:{i},name:{height}p' for i, (height, _, _) in enumerate(ladder))
+        cmd += ['-f', 'hls', '-hls_time', '1', '-hls_playlist_type', 'vod',
+                '-hls_flags', 'independent_segments', '-hls_segment_type', 'fmp4',
+                '-hls_segment_filename', os.path.join(out_dir, '%v', 'seg_%03d.m4s'),
+                '-master_pl_name', MASTER_PLAYLIST, '-var_stream_map', var_map,
+                os.path.join(out_dir, '%v', 'index.m3u8')]
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"  ERROR: Could not write the streaming ladder: {result.stderr.strip()}")
+        return False
+    print(f"Streaming ladder written: {out_dir} ({', '.join(f'{h}p' for h, _, _ in ladder)})")
+    return True
@@ -15,8 +15,8 @@ def str_to_seconds(time_str):
     parts = time_str.split(':')
     return int(parts[0]) * 60 + int(parts[1])
 
-def rescale_timings():
-    with open(FILE_PATH, 'r', encoding='utf-8') as f:
+def rescale_timings(scale=SCALE_FACTOR, file_path=FILE_PATH):
+    with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
     def replace_timing(match):
@@ -26,8 +26,8 @@ def rescale_timings():
         start_sec = str_to_seconds(start_str)
         end_sec = str_to_seconds(end_str)
         
-        new_start_sec = start_sec * SCALE_FACTOR
-        new_end_sec = end_sec * SCALE_FACTOR
+        new_start_sec = start_sec * scale
+        new_end_sec = end_sec * scale
         
         # Calculate duration for the parenthesis (X s)
         duration = int(new_end_sec - new_start_sec)
@@ -45,7 +45,7 @@ def rescale_timings():
     # Update Total Duration header if present
     # "**Total Duration:** ~2 min 35 sec" -> update manually or ignore, let's just update the file body
     
-    with open(FILE_PATH, 'w', encoding='utf-8') as f:
+    with open(file_path, 'w', encoding='utf-8') as f:
         f.write(new_content)
     
     print("Timings rescaled successfully.")
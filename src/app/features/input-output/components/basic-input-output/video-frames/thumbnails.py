@@ -0,0 +1,113 @@
+"""
+Scrub-preview thumbnails: sprite sheets plus a WebVTT track.
+
+Each distinct slide (image plus its highlights) becomes one preview-size
+tile, taken from the frame the builder has just decoded (overlays.composite)
+rather than from the finished video. Tiles are packed into JPEG or WebP
+sprite sheets next to the video, and <video>.thumbs.vtt maps every stretch
+of the timeline to its tile with a "#xywh=" fragment, so a player needs one
+request per sheet instead of one per slide.
+"""
+
+import os
+import PIL.Image
+from captions import format_timestamp
+from overlays import composite
+
+THUMB_WIDTH = 160
+# Tiles per sheet: columns x rows
+SHEET_GRID = (10, 10)
+FORMATS = {
+    'jpg': ('JPEG', {'quality': 80, 'optimize': True}),
+    'webp': ('WEBP', {'quality': 75, 'method': 4}),
+}
+
+def canvas_size(segments):
+    """Frame size shared by every segment, so encoded segments can be joined by stream copy.
+
+    Matches what concatenate_videoclips(method="compose") did: the largest
+    image sets the size and smaller ones are centred. Only headers are read.
+    """
+    width = height = 0
+    for seg in segments:
+        for img_path in seg['images']:
+            with PIL.Image.open(img_path) as img:
+                width, height = max(width, img.size[0]), max(height, img.size[1])
+    # libx264 needs even dimensions
+    return (width + width % 2, height + height % 2)
+
+class ThumbnailTrack:
+    """Preview tiles collected while a video is built, written as sprite sheets and a VTT track"""
+
+    def __init__(self, canvas, image_format='jpg'):
+        self.canvas = canvas
+        self.scale = THUMB_WIDTH / canvas[0]
+        self.size = (THUMB_WIDTH, max(2, round(canvas[1] * self.scale)))
+        self.image_format = image_format
+        self.tiles = []   # preview-size PIL images
+        self.index = {}   # (image path, highlight line) -> tile number
+        self.cues = []    # (start, end, tile number)
+
+    def add_frames(self, seg, images=None):
+        """Tile numbers for a segment's images; a slide already seen reuses its tile.
+
+        Called right after the segment is built, while its decoded images are
+        still in overlays' cache.
+        """
+        numbers = []
+        for img_path in images or seg['images']:
+            key = (img_path, seg.get('highlight'))
+            if key not in self.index:
+                self.index[key] = len(self.tiles)
+                self.tiles.append(self.make_tile(composite(img_path, seg['highlights'])))
+            numbers.append(self.index[key])
+        return numbers
+
+    def make_tile(self, frame):
+        # The frame as the video shows it: centred on the canvas, here scaled down
+        height, width = frame.shape[:2]
+        size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+        thumb = PIL.Image.fromarray(frame).resize(size, PIL.Image.LANCZOS, reducing_gap=3.0)
+        tile = PIL.Image.new('RGB', self.size)
+        tile.paste(thumb, ((self.size[0] - size[0]) // 2, (self.size[1] - size[1]) // 2))
+        return tile
+
+    def add_cues(self, numbers, start, duration):
+        """The segment's images share its time evenly, as in build_segment"""
+        if not numbers:
+            return
+        per_image = duration / len(numbers)
+        for k, number in enumerate(numbers):
+            self.cues.append((start + k * per_image, start + (k + 1) * per_image, number))
+
+    def write(self, video_file):
+        """Writes <video>.thumbs_<n>.<ext> sheets and <video>.thumbs.vtt; returns the VTT path"""
+        if not self.cues:
+            return None
+        base = os.path.splitext(video_file)[0]
+        pil_format, options = FORMATS[self.image_format]
+        columns, rows = SHEET_GRID
+        per_sheet = columns * rows
+        width, height = self.size
+
+        sheet_names = []
+        for first in range(0, len(self.tiles), per_sheet):
+            tiles = self.tiles[first:first + per_sheet]
+            used_rows = -(-len(tiles) // columns)
+            sheet = PIL.Image.new('RGB', (width * min(columns, len(tiles)), height * used_rows))
+            for k, tile in enumerate(tiles):
+                sheet.paste(tile, ((k % columns) * width, (k // columns) * height))
+            sheet_file = f"{base}.thumbs_{len(sheet_names)}.{self.image_format}"
+            sheet.save(sheet_file, pil_format, **options)
+            sheet_names.append(os.path.basename(sheet_file))
+
+        vtt_file = base + '.thumbs.vtt'
+        with open(vtt_file, 'w', encoding='utf-8') as f:
+            f.write("WEBVTT\n\n")
+            for start, end, number in self.cues:
+                sheet, k = divmod(number, per_sheet)
+                x, y = (k % columns) * width, (k // columns) * height
+                f.write(f"{format_timestamp(start, '.')} --> {format_timestamp(end, '.')}\n"
+                        f"{sheet_names[sheet]}#xywh={x},{y},{width},{height}\n\n")
+        print(f"Thumbnail track written: {vtt_file} ({len(self.tiles)} tiles, {len(sheet_names)} sheet(s))")
+        return vtt_file
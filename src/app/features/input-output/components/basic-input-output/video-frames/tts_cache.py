@@ -0,0 +1,60 @@
+"""
+Content-addressed cache of synthesized narration.
+
+Each segment's audio is stored as tts_cache/<hash of voice + text>.mp3, so an
+unchanged line is never sent to the TTS service twice and the slide deck can
+embed exactly the audio the video was rendered with. index.json records the
+duration of each file, as decoded by the video build (before it trims the
+silence). Standard library only.
+"""
+
+import os
+import json
+import hashlib
+
+CACHE_DIR = 'tts_cache'
+INDEX_FILE = os.path.join(CACHE_DIR, 'index.json')
+
+# VOICE CONFIGURATION
+VOICE = "en-US-ChristopherNeural"
+# Tried in order when the primary voice fails; each voice's audio is cached under its own key
+FALLBACK_VOICES = ("en-US-AriaNeural", "en-US-GuyNeural")
+
+# edge-tts default output format: audio-24khz-48kbitrate-mono-mp3 (constant bitrate)
+EDGE_TTS_BITRATE = 48000
+
+def cache_key(text, voice=VOICE):
+    return hashlib.sha1(f"{voice}\n{text}".encode('utf-8')).hexdigest()[:16]
+
+def audio_path(text, voice=VOICE):
+    return os.path.join(CACHE_DIR, cache_key(text, voice) + '.mp3')
+
+def load_index():
+    try:
+        with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_index(index):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+
+def estimate_duration(audio_file):
+    """Duration of a constant-bitrate edge-tts MP3 from its size, without decoding it"""
+    return os.path.getsize(audio_file) * 8 / EDGE_TTS_BITRATE
+
+def find_narration(text, index):
+    """(audio file, duration, voice) for a segment's text, or None if it was never synthesized.
+
+    The primary voice is preferred over a fallback voice's audio. The
+    duration is the one the video build decoded, or else estimated from the
+    file size.
+    """
+    for voice in (VOICE,) + FALLBACK_VOICES:
+        path = audio_path(text, voice)
+        if os.path.exists(path):
+            entry = index.get(cache_key(text, voice), {})
+            return path, entry.get('audio_duration') or estimate_duration(path), voice
+    return None
@@ -0,0 +1,98 @@
+"""
+Single entry point for the video-frames tools.
+
+Each subcommand imports its heavy dependencies (moviepy, edge-tts,
+python-pptx) only when it runs, so `validate` starts in milliseconds and
+never loads them.
+
+Usage:
+    python video_tools.py validate
+    python video_tools.py render [--from-audio] [--mux-captions] [--ladder DIR [--dash]] [--thumbnails webp]
+    python video_tools.py ppt [--full | --narrated]
+    python video_tools.py retime --scale 0.68
+"""
+
+import os
+import sys
+import argparse
+
+from voiceover_script import SCRIPT_FILE
+
+def cmd_validate(args):
+    from voiceover_script import validate_script
+
+    problems = validate_script(args.script)
+    for problem in problems:
+        print(problem)
+    if problems:
+        print(f"{len(problems)} problem(s) in {args.script}")
+        return 1
+    print(f"{args.script} is valid.")
+    return 0
+
+def cmd_render(args):
+    if args.from_audio:
+        from build_video_from_audio import build_video
+        build_video(args.script, args.thumbnails)
+        return 0
+
+    import asyncio
+    from voiceover_script import narration_segments
+    from build_video import create_video_async
+
+    segments = narration_segments(args.script)
+    if not segments:
+        print("No segments found in transcript!")
+        return 1
+    asyncio.run(create_video_async(segments, mux_captions=args.mux_captions,
+                                   ladder_dir=args.ladder, dash=args.dash, thumbnail_format=args.thumbnails))
+    return 0
+
+def cmd_ppt(args):
+    from build_ppt import create_ppt
+    create_ppt(incremental=not args.full, transcript_file=args.script, narrated=args.narrated)
+    return 0
+
+def cmd_retime(args):
+    from rescale_timings import rescale_timings, SCALE_FACTOR
+    rescale_timings(args.scale or SCALE_FACTOR, args.script)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the tutorial video and slides from the voiceover script")
+    parser.add_argument('--script', help=f"voiceover script (default: {SCRIPT_FILE} next to this tool)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('validate', help="check the script and its images without rendering")
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser('render', help="render the video")
+    p.add_argument('--from-audio', action='store_true', help="use the recorded narration and script timings instead of TTS")
+    p.add_argument('--mux-captions', action='store_true', help="also embed the captions as a subtitle stream")
+    p.add_argument('--ladder', metavar='DIR', help="also write an HLS rendition ladder to DIR")
+    p.add_argument('--dash', action='store_true', help="with --ladder: DASH manifest plus HLS playlists over shared segments")
+    p.add_argument('--thumbnails', choices=['jpg', 'webp'], default='jpg',
+                   help="image format of the scrub-preview sprite sheets (default: jpg)")
+    p.set_defaults(func=cmd_render)
+
+    p = sub.add_parser('ppt', help="build or patch the slide deck")
+    p.add_argument('--full', action='store_true', help="rebuild the deck instead of patching it")
+    p.add_argument('--narrated', action='store_true', help="self-running deck with the rendered narration embedded")
+    p.set_defaults(func=cmd_ppt)
+
+    p = sub.add_parser('retime', help="scale every **Timing:** line in the script")
+    p.add_argument('--scale', type=float, help="factor to apply (default: rescale_timings.SCALE_FACTOR)")
+    p.set_defaults(func=cmd_retime)
+
+    args = parser.parse_args(argv)
+
+    # Relative image paths in the script are relative to this folder
+    args.script = os.path.abspath(args.script) if args.script else None
+    if getattr(args, 'ladder', None):
+        args.ladder = os.path.abspath(args.ladder)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    args.script = args.script or SCRIPT_FILE
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
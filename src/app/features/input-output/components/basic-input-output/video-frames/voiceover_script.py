@@ -0,0 +1,193 @@
+"""
+Voiceover script parsing, shared by the video and slide builders.
+
+Standard library only, so a script can be parsed and checked (see
+validate_script) without loading moviepy, edge-tts or python-pptx.
+Image names are returned as written; assets.preflight resolves them.
+A **Highlight:** line is returned raw as 'highlight' (see highlights.py).
+"""
+
+import re
+from assets import AssetIndex, preflight, prepare_highlights, format_report
+
+SCRIPT_FILE = 'voiceover-script.md'
+
+HIGHLIGHT_RE = re.compile(r'\*\*Highlight:\*\*\s*([^\n\r]+)')
+
+def find_highlight(block):
+    match = HIGHLIGHT_RE.search(block)
+    return match.group(1).strip() if match else None
+
+def clean_text(text):
+    """Removes markdown formatting vs code quotes etc"""
+    text = text.replace('`', '').replace('*', '')
+    text = text.replace('<', ' ').replace('>', ' ')
+    text = text.replace('[', ' ').replace(']', ' ')
+    text = text.replace('(', ' ').replace(')', ' ')
+    text = text.replace('"', '').replace("'", "")
+    text = text.replace('\n', ' ')
+    return text.strip()
+
+def parse_transcript(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    segments = []
+    # Regex to find segments
+    seg_blocks = content.split('## Segment')
+    for block in seg_blocks[1:]: # Skip preamble
+        try:
+            image_match = re.search(r'\*\*Image to use:\*\*\s*`?([^`\n\r]+)`?', block)
+            transcript_match = re.search(r'\*\*Transcript:\*\*\s*"([^"]+)"', block, re.DOTALL)
+            effect_match = re.search(r'\*\*Effect:\*\*\s*([^\n\r]+)', block)
+            
+            if not transcript_match:
+                 transcript_match = re.search(r'\*\*Transcript:\*\*\s*([\s\S]+?)(?:---|$)', block)
+
+            if image_match and transcript_match:
+                img_name = image_match.group(1).strip()
+                transcript_text = clean_text(transcript_match.group(1))
+                effect = effect_match.group(1).strip() if effect_match else None
+                
+                # Legacy check removed to support multi-image strings
+                # if not os.path.exists(img_name):
+                #    print(f"WARNING: Image not found: {img_name}")
+                #    continue
+
+                segments.append({
+                    'image': img_name,
+                    'text': transcript_text,
+                    'effect': effect,
+                    'highlight': find_highlight(block)
+                })
+        except Exception as e:
+            print(f"Error parsing block: {e}")
+            continue
+            
+    return segments
+
+def time_to_seconds(time_str):
+    """Converts 'M:SS' or 'H:MM:SS' string to seconds (float)."""
+    try:
+        parts = time_str.strip().split(':')
+        if len(parts) == 2:
+            return int(parts[0]) * 60 + int(parts[1])
+        elif len(parts) == 3:
+            return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+    except ValueError:
+        pass
+    return 0.0
+
+def parse_transcript_timings(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    segments = []
+    # Regex to split by frames
+    blocks = re.split(r'## (?:Frame|Segment)', content)
+    
+    for block in blocks[1:]: # Skip header
+        # Extract Image path
+        img_match = re.search(r'\*\*Image(?: to use)?:\*\*\s*`?([^`\n\r]+)`?', block)
+        
+        # Extract Timing: e.g. "0:00 – 0:07"
+        # Note: The separator might be a hyphen -, en-dash –, or em-dash —
+        timing_match = re.search(r'\*\*Timing:\*\*\s*(\d+:\d+)\s*[–-—]\s*(\d+:\d+)', block)
+        
+        if img_match and timing_match:
+            img_path = img_match.group(1).strip()
+            start_str = timing_match.group(1)
+            end_str = timing_match.group(2)
+            
+            start_sec = time_to_seconds(start_str)
+            end_sec = time_to_seconds(end_str)
+            
+            segments.append({
+                'image': img_path,
+                'start': start_sec,
+                'end': end_sec,
+                'duration': end_sec - start_sec,
+                'highlight': find_highlight(block)
+            })
+            
+    return segments
+
+def parse_frames(file_path):
+    """Frames in either script format (## Frame / ## Segment), with raw voiceover text"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    segments = []
+    # Regex to split by frames
+    blocks = re.split(r'## (?:Frame|Segment)', content)
+    
+    for block in blocks[1:]: # Skip header
+        # Extract Image path
+        img_match = re.search(r'\*\*Image(?: to use)?:\*\*\s*`?([^`\n\r]+)`?', block)
+        
+        # Extract Transcript/Voiceover
+        transcript_match = re.search(r'\*\*(?:Voiceover|Transcript):\*\*\s*(?:")?([\s\S]+?)(?:")?(?:\n---|#|$)', block)
+        
+        if img_match:
+            img_path = img_match.group(1).strip()
+            
+            # Clean text
+            text = ""
+            if transcript_match:
+                 raw_text = transcript_match.group(1).strip()
+                 if raw_text.startswith('"') and raw_text.endswith('"'):
+                    raw_text = raw_text[1:-1]
+                 text = raw_text
+            
+            segments.append({
+                'image': img_path,
+                'text': text,
+                'highlight': find_highlight(block)
+            })
+            
+    return segments
+
+def narration_segments(file_path):
+    """Segments as the video build narrates them; the slide deck's narrated mode uses the same list.
+
+    Scripts in the '## Segment' format are read by parse_transcript; scripts
+    in the '## Frame' format get the same text cleanup applied to their frames.
+    """
+    segments = parse_transcript(file_path)
+    if segments:
+        return segments
+    return [{'image': frame['image'], 'text': clean_text(frame['text']), 'effect': None,
+             'highlight': frame['highlight']}
+            for frame in parse_frames(file_path) if frame['text']]
+
+TIMING_LINE_RE = re.compile(r'\*\*Timing:\*\*')
+
+def validate_script(file_path):
+    """Checks a script without rendering anything; returns a list of problems"""
+    problems = []
+    frames = parse_frames(file_path)
+    if not frames:
+        return [f"{file_path}: no '## Frame' or '## Segment' blocks with an image"]
+
+    index = AssetIndex()
+    problems.extend(format_report(preflight(frames, index)))
+    problems.extend(prepare_highlights(frames, index))
+    for n, frame in enumerate(frames, 1):
+        if not frame['text']:
+            problems.append(f"Segment {n}: no voiceover text")
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        timing_lines = len(TIMING_LINE_RE.findall(f.read()))
+    timings = parse_transcript_timings(file_path)
+    if timing_lines != len(timings):
+        problems.append(f"{timing_lines - len(timings)} timing line(s) could not be parsed")
+
+    previous_end = 0
+    for n, seg in enumerate(timings, 1):
+        if seg['duration'] <= 0:
+            problems.append(f"Timed segment {n}: ends before it starts ({seg['start']}s -> {seg['end']}s)")
+        if seg['start'] < previous_end:
+            problems.append(f"Timed segment {n}: starts at {seg['start']}s, before the previous segment ends ({previous_end}s)")
+        previous_end = max(previous_end, seg['end'])
+
+    return problems
@@ -0,0 +1,216 @@
+"""
+Watch daemon that keeps the docs indexes, TOCs and gallery live.
+
+After one startup build it only reacts to change events: a saved guide gets
+its TOC refreshed and its DOC_INDEX.md entry updated, and a changed gallery
+image gets its variants re-encoded. Events are debounced so an editor's
+save-rename-touch burst triggers the work once.
+
+Uses watchdog (inotify / ReadDirectoryChangesW / FSEvents) when installed
+and falls back to polling the guides and gallery images.
+
+Usage:
+    python watch_docs.py
+    python watch_docs.py --poll --interval 1.0
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+
+import index_guides
+from add_toc_to_guides import process_guide
+
+# The gallery needs Pillow; without it only guides are watched
+try:
+    import build_gallery
+except ImportError:
+    build_gallery = None
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+DEBOUNCE_SECONDS = 0.15
+POLL_INTERVAL = 1.0
+
+def is_guide(path):
+    if not path.endswith("guide.md"):
+        return False
+    rel = os.path.relpath(path, index_guides.features_dir)
+    parts = rel.split(os.sep)
+    return not rel.startswith('..') and not index_guides.PRUNE_DIRS.intersection(parts)
+
+def is_gallery_image(path):
+    return (build_gallery is not None
+            and os.path.dirname(path) == build_gallery.gallery_dir
+            and path.lower().endswith(build_gallery.SOURCE_EXTS))
+
+class DocsWatcher:
+    """Collects changed paths and dispatches only the work they affect"""
+
+    def __init__(self):
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.last_event = 0.0
+        self.cache = {}
+        self.guides = {}
+
+    def start(self):
+        print("Initial build...")
+        self.cache = index_guides.load_cache()
+        guides, _ = index_guides.collect_guides(self.cache)
+        index_guides.save_cache(self.cache)
+        self.guides = {guide['full_path']: guide for guide in guides}
+        for path in self.guides:
+            process_guide(path)
+        self.write_index()
+        self.refresh_gallery()
+
+    def notify(self, path):
+        if not (is_guide(path) or is_gallery_image(path)):
+            return
+        with self.lock:
+            self.pending.add(path)
+            self.last_event = time.monotonic()
+        self.wake.set()
+
+    def run(self):
+        """Dispatcher loop: waits for events, then for a quiet period, then works"""
+        while True:
+            self.wake.wait()
+            while True:
+                with self.lock:
+                    quiet_for = time.monotonic() - self.last_event
+                if quiet_for >= DEBOUNCE_SECONDS:
+                    break
+                time.sleep(DEBOUNCE_SECONDS - quiet_for)
+
+            with self.lock:
+                paths, self.pending = self.pending, set()
+                self.wake.clear()
+            try:
+                self.dispatch(paths)
+            except Exception as e:
+                print(f"Error handling {len(paths)} change(s): {e}")
+
+    def dispatch(self, paths):
+        started = time.perf_counter()
+        guides = sorted(p for p in paths if is_guide(p))
+        for path in guides:
+            self.update_guide(path)
+        if guides:
+            self.write_index()
+        if any(is_gallery_image(p) for p in paths):
+            self.refresh_gallery()
+        print(f"Handled {len(paths)} change(s) in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    def update_guide(self, path):
+        if not os.path.exists(path):
+            self.guides.pop(path, None)
+            self.cache.pop(path, None)
+            print(f"Removed: {path}")
+            return
+
+        if process_guide(path):
+            print(f"TOC updated: {path}")
+        st = os.stat(path)
+        title = index_guides.read_title(path)
+        self.cache[path] = {"size": st.st_size, "mtime": st.st_mtime_ns, "title": title}
+        self.guides[path] = index_guides.guide_entry(path, title)
+
+    def write_index(self):
+        index_guides.save_cache(self.cache)
+        content = index_guides.render_index(index_guides.sort_guides(self.guides.values()))
+        if index_guides.write_if_changed(index_guides.output_file, content):
+            print(f"Index updated: {index_guides.output_file}")
+
+    def refresh_gallery(self):
+        if build_gallery is None:
+            return
+        entries = build_gallery.build_variants()
+        for path, content in ((build_gallery.manifest_file, build_gallery.build_manifest(entries)),
+                              (build_gallery.gallery_md, build_gallery.build_gallery_md(entries))):
+            if index_guides.write_if_changed(path, content):
+                print(f"Updated: {path}")
+
+# Events that can change a file. watchdog >= 3 also reports opened and
+# closed_no_write, which the watcher's own reads would otherwise turn into
+# an endless loop of re-processing the same guide.
+CHANGE_EVENTS = {'created', 'modified', 'moved', 'deleted', 'closed'}
+
+class EventHandler(FileSystemEventHandler):
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in CHANGE_EVENTS:
+            return
+        self.watcher.notify(event.src_path)
+        dest_path = getattr(event, 'dest_path', None)
+        if dest_path:
+            self.watcher.notify(dest_path)
+
+def watch_with_observer(watcher):
+    observer = Observer()
+    handler = EventHandler(watcher)
+    observer.schedule(handler, index_guides.features_dir, recursive=True)
+    if build_gallery is not None:
+        observer.schedule(handler, build_gallery.gallery_dir, recursive=False)
+    observer.start()
+    return observer
+
+def snapshot():
+    """Stat of every guide and gallery image, for the polling fallback"""
+    state = {path: (st.st_size, st.st_mtime_ns) for path, st in index_guides.find_guides(index_guides.features_dir)}
+    if build_gallery is None:
+        return state
+    for entry in os.scandir(build_gallery.gallery_dir):
+        if entry.is_file() and is_gallery_image(entry.path):
+            st = entry.stat()
+            state[entry.path] = (st.st_size, st.st_mtime_ns)
+    return state
+
+def poll_forever(watcher, interval):
+    previous = snapshot()
+    while True:
+        time.sleep(interval)
+        current = snapshot()
+        for path in set(previous) | set(current):
+            if previous.get(path) != current.get(path):
+                watcher.notify(path)
+        previous = current
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep DOC_INDEX.md, guide TOCs and the gallery up to date")
+    parser.add_argument('--poll', action='store_true', help="poll instead of using filesystem events")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help="polling interval in seconds")
+    args = parser.parse_args(argv)
+
+    watcher = DocsWatcher()
+    watcher.start()
+    threading.Thread(target=watcher.run, daemon=True).start()
+
+    try:
+        if Observer is not None and not args.poll:
+            print(f"Watching {index_guides.features_dir} (filesystem events)")
+            observer = watch_with_observer(watcher)
+            while observer.is_alive():
+                observer.join(1)
+        else:
+            if not args.poll:
+                print("watchdog is not installed; falling back to polling.")
+            print(f"Polling every {args.interval}s")
+            poll_forever(watcher, args.interval)
+    except KeyboardInterrupt:
+        print("Stopped.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""
+Process-pool dispatch shared by the build scripts (build_gallery, build_site).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+def run_jobs(worker, jobs):
+    """Runs worker(*args) for every key -> args in jobs.
+
+    Yields (key, result, error) in the order of jobs, with error set to the
+    exception a job raised. A single job (the watcher's or an edit's common
+    case) is run inline, as it is not worth starting a process pool.
+    """
+    if len(jobs) < 2:
+        for key, args in jobs.items():
+            try:
+                yield key, worker(*args), None
+            except Exception as e:
+                yield key, None, e
+        return
+
+    with ProcessPoolExecutor() as pool:
+        futures = {key: pool.submit(worker, *args) for key, args in jobs.items()}
+        for key, future in futures.items():
+            try:
+                yield key, future.result(), None
+            except Exception as e:
+                yield key, None, e